@@ -0,0 +1,165 @@
+"""
+Outbound gateway transport at high concurrency against a local HTTP/2-capable
+Paystack stub (hypercorn, h2c prior knowledge, --latency-ms simulated latency):
+
+  - requests, one connection per call (the old transport)
+  - the gateway client (httpx on the per-process event loop) pooled over HTTP/1.1
+  - the gateway client multiplexed over HTTP/2
+  - PaystackService verify micro-batching over HTTP/1.1 and HTTP/2
+
+Like Paystack at volume, the stub's transaction list only covers part of the
+references (--listed), so batches also exercise the per-reference fallback. It
+lists each covered reference twice, newest attempt first, and the batching run
+counts results that picked the stale attempt.
+
+Reports throughput, latency and how many TCP connections the stub accepted.
+
+    cd apps/api
+    pip install hypercorn requests
+    python benchmarks/gateway_transport.py --calls 2000 --concurrency 64 --listed 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.services.payment_service import PaystackService  # noqa: E402
+from server.utils.http_client import GatewayHTTPClient  # noqa: E402
+
+# ------------------------------------------------------
+
+PORT = 5077
+BASE_URL = f"http://127.0.0.1:{PORT}"
+REFERENCES = [f"txn_bench{i:04d}" for i in range(50)]
+
+
+def serve_stub(latency, listed):
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    clients = set()
+    covered = REFERENCES[: int(len(REFERENCES) * listed)]
+    # Newest first: the current attempt, then an older abandoned one for the same reference
+    listing = []
+    for r in covered:
+        listing.append({"reference": f"{r}_2", "status": "success", "metadata": {"internal_gateway_ref": r}})
+        listing.append({"reference": f"{r}_1", "status": "abandoned", "metadata": {"internal_gateway_ref": r}})
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        clients.add(tuple(scope["client"]))
+        path = scope["path"]
+
+        if path == "/stats":
+            body = {"connections": len(clients)}
+        elif path == "/reset":
+            clients.clear()
+            body = {}
+        elif path == "/transaction":
+            await asyncio.sleep(latency)
+            body = {"status": True, "data": listing}
+        else:
+            await asyncio.sleep(latency)
+            body = {"status": True, "data": {"reference": path.rsplit("/", 1)[-1], "status": "success"}}
+
+        payload = json.dumps(body).encode()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": payload})
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{PORT}"]
+    config.loglevel = "ERROR"
+    config.keep_alive_max_requests = 1_000_000  # no GOAWAY mid-benchmark
+    asyncio.run(serve(app, config))
+
+
+def run(name, call, calls, concurrency):
+    requests.get(f"{BASE_URL}/reset")
+    latencies = []
+    stale = []
+    errors = []
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            resp = call(REFERENCES[i % len(REFERENCES)])
+        except Exception as exc:
+            errors.append(exc)
+            return
+        latencies.append(time.perf_counter() - start)
+        if resp["data"]["status"] != "success":
+            stale.append(resp)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(calls)))
+    elapsed = time.perf_counter() - start
+
+    # Minus the connection the /stats call itself opens
+    connections = requests.get(f"{BASE_URL}/stats").json()["connections"] - 1
+    latencies.sort()
+    print(
+        f"{name:<22} {calls / elapsed:>8.1f} calls/s  p50 {statistics.median(latencies) * 1000:>7.2f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>7.2f} ms  max {latencies[-1] * 1000:>7.2f} ms  "
+        f"connections {connections}  stale {len(stale)}  errors {len(errors)}"
+    )
+    if errors:
+        print(f"{'':<22} first error: {errors[0]!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--listed", type=float, default=0.5, help="fraction of references on the list page")
+    args = parser.parse_args()
+
+    stub = multiprocessing.Process(target=serve_stub, args=(args.latency_ms / 1000, args.listed), daemon=True)
+    stub.start()
+    for _ in range(50):
+        try:
+            requests.get(f"{BASE_URL}/reset", timeout=0.5)
+            break
+        except requests.ConnectionError:
+            time.sleep(0.1)
+
+    limits = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+    http1 = GatewayHTTPClient(limits=limits)
+    http2 = GatewayHTTPClient(http1=False, http2=True, limits=limits)  # h2c prior knowledge
+
+    os.environ["PAYSTACK_BASE_URL"] = BASE_URL
+    os.environ["PAYSTACK_BATCH_VERIFY"] = "true"
+    service = PaystackService()
+    service.http.close()
+    service.http = http1
+    service_h2 = PaystackService()
+    service_h2.http.close()
+    service_h2.http = http2
+
+    try:
+        run("requests (no pooling)", lambda ref: requests.get(f"{BASE_URL}/transaction/verify/{ref}").json(), args.calls, args.concurrency)
+        run("client HTTP/1.1 pooled", lambda ref: http1.get(f"{BASE_URL}/transaction/verify/{ref}").json(), args.calls, args.concurrency)
+        run("client HTTP/2", lambda ref: http2.get(f"{BASE_URL}/transaction/verify/{ref}").json(), args.calls, args.concurrency)
+        run("HTTP/1.1 + batching", service.verify_payment, args.calls, args.concurrency)
+        run("HTTP/2 + batching", service_h2.verify_payment, args.calls, args.concurrency)
+    finally:
+        http1.close()
+        http2.close()
+        stub.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Per-request auth overhead of `@jwt_required()` with the stock JWTManager
+versus CachedJWTManager, for the same token presented repeatedly (the
+verify/OTP polling pattern).
+
+    cd apps/api
+    python benchmarks/jwt_auth.py --iterations 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token, verify_jwt_in_request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.utils.jwt_cache import CachedJWTManager  # noqa: E402
+
+# ------------------------------------------------------
+
+
+def measure(manager_cls, iterations):
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "bench-secret-key-of-a-reasonable-length"
+    manager_cls().init_app(app)
+
+    with app.app_context():
+        token = create_access_token(identity="42")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with app.test_request_context(headers=headers):
+            verify_jwt_in_request()
+    total = time.perf_counter() - start
+
+    # Request context setup alone, to subtract from the totals above
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with app.test_request_context(headers=headers):
+            pass
+    baseline = time.perf_counter() - start
+
+    return (total - baseline) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    stock = measure(JWTManager, args.iterations)
+    cached = measure(CachedJWTManager, args.iterations)
+    print(f"JWTManager        {stock:8.2f} us/request")
+    print(f"CachedJWTManager  {cached:8.2f} us/request  ({stock / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
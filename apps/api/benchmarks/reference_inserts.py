@@ -0,0 +1,83 @@
+"""
+Insert throughput into a large transaction table for the old random references
+(`"txn_" + uuid4().hex[:10]`) versus the time-ordered ones, with the unique
+index on gateway_ref in place. The page cache is kept small so the index does
+not fit in memory, as on a production-sized table.
+
+    cd apps/api
+    python benchmarks/reference_inserts.py --prefill 1000000 --inserts 200000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.utils.reference import ReferenceGenerator  # noqa: E402
+
+# ------------------------------------------------------
+
+BATCH = 1000
+
+
+def random_reference():
+    return "txn_" + uuid.uuid4().hex[:10]
+
+
+def bench(name, make_reference, args, tmp):
+    path = os.path.join(tmp, f"{name}.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA cache_size = -{args.cache_kb}")
+    conn.execute(
+        "CREATE TABLE txn (id INTEGER PRIMARY KEY, gateway_ref VARCHAR(64) UNIQUE NOT NULL, "
+        "amount INTEGER NOT NULL, gateway VARCHAR(32) NOT NULL, status VARCHAR(10) NOT NULL, customer_id INTEGER NOT NULL)"
+    )
+
+    collisions = 0
+
+    def insert(count):
+        # OR IGNORE so a duplicate reference is counted instead of aborting the run
+        nonlocal collisions
+        for _ in range(0, count, BATCH):
+            rows = [(make_reference(), 5000, "paystack", "pending", 1) for _ in range(BATCH)]
+            cursor = conn.executemany(
+                "INSERT OR IGNORE INTO txn (gateway_ref, amount, gateway, status, customer_id) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            collisions += len(rows) - cursor.rowcount
+            conn.commit()
+
+    insert(args.prefill)
+
+    start = time.perf_counter()
+    insert(args.inserts)
+    elapsed = time.perf_counter() - start
+
+    conn.close()
+    size_mb = os.path.getsize(path) / 1e6
+    print(
+        f"{name:<12} {args.inserts / elapsed:>10.0f} inserts/s  db size {size_mb:>7.1f} MB  "
+        f"reference collisions {collisions}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prefill", type=int, default=1_000_000)
+    parser.add_argument("--inserts", type=int, default=200_000)
+    parser.add_argument("--cache-kb", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"prefill {args.prefill} rows, then time {args.inserts} inserts in batches of {BATCH}")
+    with tempfile.TemporaryDirectory() as tmp:
+        bench("uuid4[:10]", random_reference, args, tmp)
+        bench("time-ordered", ReferenceGenerator().generate, args, tmp)
+
+
+if __name__ == "__main__":
+    main()
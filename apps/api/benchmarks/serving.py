@@ -0,0 +1,152 @@
+"""
+Compare the dev server (run.py style) against the gunicorn production profile
+on the list and initiate endpoints. Gateway calls go to a local stub so only
+our own serving overhead is measured.
+
+    cd apps/api
+    python benchmarks/serving.py --requests 2000 --concurrency 32
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# ------------------------------------------------------
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StubGateway(BaseHTTPRequestHandler):
+    """Answers every gateway call with a pending Paystack-like payload."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"status": True, "data": {"status": "pending", "reference": "stub"}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST
+
+    def log_message(self, *args):
+        pass
+
+
+def wait_until_up(base_url, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(f"{base_url}/apidocs/", timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+def run_load(method, url, token, total, concurrency, body=None):
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    latencies = []
+
+    def one(_):
+        start = time.perf_counter()
+        resp = session.request(method, url, json=body)
+        latencies.append(time.perf_counter() - start)
+        return resp.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        codes = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": sum(1 for c in codes if c >= 400),
+    }
+
+
+def bench_profile(name, cmd, port, env, args):
+    base_url = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(cmd, cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(base_url)
+        creds = {"email": f"{name}@bench.io", "password": "bench-password"}
+        requests.post(f"{base_url}/api/auth/register", json=creds)
+        token = requests.post(f"{base_url}/api/auth/login", json=creds).json()["access_token"]
+
+        results = {
+            "list": run_load("GET", f"{base_url}/api/transactions/", token, args.requests, args.concurrency),
+            "initiate": run_load(
+                "POST",
+                f"{base_url}/api/transactions/initiate",
+                token,
+                args.requests,
+                args.concurrency,
+                body={"amount": 5000, "gateway": "paystack"},
+            ),
+        }
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    for endpoint, r in results.items():
+        print(
+            f"{name:<12} {endpoint:<9} {r['rps']:>9.1f} req/s  "
+            f"p50 {r['p50_ms']:>7.2f} ms  p99 {r['p99_ms']:>7.2f} ms  errors {r['errors']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    stub = ThreadingHTTPServer(("127.0.0.1", 0), StubGateway)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{tmp}/bench.sqlite3",
+            JWT_SECRET_KEY="bench-secret",
+            PAYSTACK_BASE_URL=f"http://127.0.0.1:{stub.server_port}",
+            RATE_LIMIT_ENABLED="false",
+        )
+        subprocess.run([sys.executable, "-m", "flask", "--app", "wsgi", "init-db"], cwd=API_DIR, env=env, check=True)
+
+        bench_profile(
+            "dev",
+            [sys.executable, "-m", "flask", "--app", "run", "run", "--debug", "--no-reload", "-p", "5055"],
+            5055,
+            env,
+            args,
+        )
+        bench_profile(
+            "production",
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+            5056,
+            dict(env, BIND="127.0.0.1:5056"),
+            args,
+        )
+
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
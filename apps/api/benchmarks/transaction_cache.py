@@ -0,0 +1,121 @@
+"""
+Status polling through GET /api/transactions/verify/<reference> with the hot
+transaction cache off and on, counting the SQL statements and commits each poll
+costs. The gateway is an in-process httpx MockTransport answering "pending", the
+common case while a client polls. Also compares per-entry memory of
+CachedTransaction records versus SQLAlchemy instances.
+
+    cd apps/api
+    python benchmarks/transaction_cache.py --transactions 20000 --polls 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# ------------------------------------------------------
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transactions", type=int, default=20_000)
+    parser.add_argument("--polls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{tmp}/bench.sqlite3",
+        JWT_SECRET_KEY="bench-secret-of-at-least-32-bytes",
+        HOT_TXN_CACHE_SIZE=str(args.transactions),
+        RATE_LIMIT_ENABLED="false",
+    )
+
+    import httpx
+    from collections import Counter
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import event
+    from server import create_app
+    from server.extensions import db, txn_cache
+    from server.models.transaction_model import Transaction
+    from server.models.user_model import User
+    from server.services.gateway_registry import gateways
+    from server.services.transaction_service import create_transaction
+    from server.utils.transaction_cache import CachedTransaction
+
+    app = create_app()
+    statements = Counter()
+
+    def gateway(request):
+        reference = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json={"status": True, "data": {"reference": reference, "status": "pending"}})
+
+    with app.app_context():
+        db.create_all()
+        event.listen(
+            db.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *a: statements.update([statement.split(None, 1)[0].upper()]),
+        )
+        event.listen(db.engine, "commit", lambda conn: statements.update(["COMMIT"]))
+
+        db.session.add(User(id=1, email="poll@bench.io", password_hash="x"))
+        db.session.commit()
+        refs = [
+            create_transaction(amount=5000, gateway="paystack", customer_id=1).gateway_ref
+            for _ in range(args.transactions)
+        ]
+        polls = [random.choice(refs) for _ in range(args.polls)]
+
+        service = gateways.get("paystack")
+        service.http.close()
+        service.http = httpx.Client(transport=httpx.MockTransport(gateway))
+        token = create_access_token(identity="1")
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    cached_entries = dict(txn_cache._entries)
+
+    for name, cache_size in (("cache off", 0), ("hot cache", args.transactions)):
+        txn_cache.clear()
+        txn_cache.max_size = cache_size
+        if cache_size:
+            txn_cache._entries.update(cached_entries)  # as filled by create_transaction
+        statements.clear()
+        start = time.perf_counter()
+        for ref in polls:
+            assert client.get(f"/api/transactions/verify/{ref}", headers=headers).status_code == 200
+        elapsed = time.perf_counter() - start
+        per_poll = ", ".join(f"{kind} {count / args.polls:.2f}" for kind, count in sorted(statements.items()))
+        print(
+            f"{name:<10} {args.polls / elapsed:>8.0f} polls/s  {elapsed / args.polls * 1e6:>7.1f} us/poll  "
+            f"per poll: {per_poll or 'no SQL'}"
+        )
+
+    # Memory per cached entry: compact records vs ORM instances held in a cache
+    with app.app_context():
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        orm_cache = {t.gateway_ref: t for t in Transaction.query.all()}
+        orm_bytes = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(before, "filename"))
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        compact = {t.gateway_ref: CachedTransaction.from_model(t, 0.0) for t in orm_cache.values()}
+        compact_bytes = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(before, "filename"))
+        tracemalloc.stop()
+
+    n = len(compact)
+    print(f"ORM instances      {orm_bytes / n:>8.0f} bytes/entry")
+    print(f"CachedTransaction  {compact_bytes / n:>8.0f} bytes/entry")
+    print(f"cache stats        {txn_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
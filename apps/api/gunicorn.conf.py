@@ -0,0 +1,68 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+# ----------------------------------
+# Production serving profile: `gunicorn -c gunicorn.conf.py wsgi:app`
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# Gateway calls are blocking I/O, so threaded workers keep a core busy while
+# requests wait on Paystack/Moniepoint.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# Import the app once in the master so workers fork with it already loaded.
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically to cap slow memory growth.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = 500
+
+accesslog = "-"
+errorlog = "-"
+
+# Workers write their metric counters here and /metrics sums them (prometheus_client
+# multiprocess mode). It has to be set before the app is imported, so it's set here.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), f"kurudu-metrics-{os.getpid()}"))
+
+
+def on_starting(server):
+    """Start with an empty metrics directory; counts left by a previous run would be summed in."""
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def post_fork(server, worker):
+    """
+    Give each worker its own connection pools, for the primary and every replica
+    bind. Connections opened in the master (if any) must not be shared across
+    processes, so drop them without closing the parent's sockets.
+    """
+    from wsgi import app
+    from server.extensions import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    """Drop the exited worker's live-process metric files (its counter totals are kept)."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def worker_exit(server, worker):
+    """Close this worker's pooled gateway connections, including retired merchant adapters."""
+    from server.services.gateway_registry import gateways
+
+    gateways.close()
@@ -1,12 +1,12 @@
 from server import create_app
-from server.extensions import db
+from server.utils.schema import upgrade_schema
 
 # ----------------------------------
 
 server = create_app()
 
 with server.app_context():
-    db.create_all()
+    upgrade_schema()
 
 if __name__ == "__main__":
     server.run(debug=True)
\ No newline at end of file
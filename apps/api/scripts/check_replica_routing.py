@@ -0,0 +1,82 @@
+"""
+Check read-replica routing against two local SQLite databases standing in for a
+primary and a replica. The replica is seeded with a row the primary doesn't have,
+so each listing shows which database answered it:
+
+  1. a listing at the start of a request is served by the replica
+  2. after the request writes a transaction, the same listing goes to the primary
+  3. a new request starts on the replica again
+
+Exits non-zero if any step is routed to the wrong database.
+
+    cd apps/api
+    python scripts/check_replica_routing.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# ------------------------------------------------------
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{tmp}/primary.sqlite3",
+        DATABASE_REPLICA_URLS=f"sqlite:///{tmp}/replica.sqlite3",
+        JWT_SECRET_KEY="routing-check-secret",
+        HOT_TXN_CACHE_SIZE="0",
+    )
+
+    from sqlalchemy import event
+    from server import create_app
+    from server.extensions import db
+    from server.models.user_model import User
+    from server.models.transaction_model import Transaction
+    from server.services.transaction_service import create_transaction, list_customer_transactions
+
+    app = create_app()
+    served_by = []
+
+    with app.app_context():
+        primary, replica = db.engines[None], db.engines["replica_0"]
+        for name, engine in (("primary", primary), ("replica", replica)):
+            db.metadata.create_all(engine)
+            event.listen(engine, "before_cursor_execute", lambda *a, name=name: served_by.append(name))
+            with engine.begin() as conn:
+                conn.execute(User.__table__.insert(), {"id": 1, "email": "r@check.io", "password_hash": "x"})
+                conn.execute(
+                    Transaction.__table__.insert(),
+                    {"gateway_ref": f"{name}_seed", "amount": 100, "gateway": "paystack", "status": "success", "customer_id": 1},
+                )
+
+    def listing():
+        served_by.clear()
+        refs = sorted(t.gateway_ref for t in list_customer_transactions(1))
+        return refs, served_by[-1]
+
+    failures = 0
+
+    def check(step, result, expected_db):
+        nonlocal failures
+        refs, db_name = result
+        ok = db_name == expected_db
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':<5} {step:<32} served by {db_name:<8} {refs}")
+
+    with app.test_request_context("/api/transactions/"):
+        check("listing before any write", listing(), "replica")
+        create_transaction(amount=5000, gateway="paystack", customer_id=1)
+        check("listing after a write", listing(), "primary")
+
+    with app.test_request_context("/api/transactions/"):
+        check("listing in a new request", listing(), "replica")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
+import time
+import click
 from flask import Flask
-from .extensions import db, jwt, swagger
+from .extensions import db, jwt, swagger, limiter, tracer, txn_cache
 from .routes.auth import auth_bp
+from .routes.metrics import metrics_bp
 from .routes.transaction import txn_bp
 from .utils.logger import logger
 
@@ -14,9 +17,58 @@ def create_app():
     db.init_app(app)
     jwt.init_app(app)
     swagger.init_app(app)
+    limiter.init_app(app)
+    tracer.init_app(app)
+    txn_cache.init_app(app)
 
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(txn_bp, url_prefix="/api/transactions")
+    if app.config["METRICS_TOKEN"]:
+        app.register_blueprint(metrics_bp)
+
+    @app.cli.command("init-db")
+    def init_db():
+        """Create database tables and add new model columns (production entry points never do this on startup)."""
+        from .utils.schema import upgrade_schema
+
+        added = upgrade_schema()
+        logger.info("Database tables created", extra_info={"added_columns": added})
+
+    @app.cli.command("set-gateway-credentials")
+    @click.argument("merchant_id", type=int)
+    @click.argument("gateway")
+    @click.option("--base-url", default=None)
+    @click.password_option("--secret-key", confirmation_prompt=False)
+    def set_credentials(merchant_id, gateway, base_url, secret_key):
+        """Store a merchant's gateway secret (encrypted with GATEWAY_CREDENTIALS_KEY)."""
+        from .services.gateway_registry import set_gateway_credentials
+
+        set_gateway_credentials(merchant_id, gateway, secret_key, base_url)
+        logger.info("Gateway credentials stored", extra_info={"merchant_id": merchant_id, "gateway": gateway})
+
+    @app.cli.command("set-user-merchant")
+    @click.argument("email")
+    @click.argument("merchant_id", type=int, required=False)
+    def set_merchant(email, merchant_id):
+        """Charge a user's payments through a merchant's gateway accounts (omit MERCHANT_ID to detach)."""
+        from .services.auth_service import set_user_merchant
+
+        if set_user_merchant(email, merchant_id) is None:
+            raise click.ClickException(f"No user with email {email}")
+        logger.info("User merchant updated", extra_info={"email": email, "merchant_id": merchant_id})
+
+    @app.cli.command("run-dispatcher")
+    def run_dispatcher():
+        """Dispatch queued gateway calls from the outbox until interrupted."""
+        from .services.outbox_service import Dispatcher
+
+        dispatcher = Dispatcher(app)
+        dispatcher.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            dispatcher.stop()
 
     logger.info("Logger initialized successfully")
 
@@ -6,11 +6,27 @@ load_dotenv()
 # ----------------------------------------------------------------------------------------
 
 
+def _read_key(name):
+    """PEM key from the `name` env var, or from the file path in `<name>_FILE`."""
+    path = os.getenv(f"{name}_FILE")
+    if path:
+        with open(path) as f:
+            return f.read()
+    return os.getenv(name)
+
+
 class Config:
     """Server configuration"""
 
     SWAGGER = {"title": "Kurudu Payment Orchestration API", "uiversion": 3, "openapi": "3.0.2"}
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "")
+    # Set JWT_ALGORITHM to RS256/ES256 to sign with JWT_PRIVATE_KEY and verify with JWT_PUBLIC_KEY,
+    # so edge services can verify tokens holding only the public key.
+    JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+    JWT_PRIVATE_KEY = _read_key("JWT_PRIVATE_KEY")
+    JWT_PUBLIC_KEY = _read_key("JWT_PUBLIC_KEY")
+    # Verified tokens kept in memory to skip re-verifying signatures (0 disables)
+    JWT_DECODE_CACHE_SIZE = int(os.getenv("JWT_DECODE_CACHE_SIZE", "10000"))
 
     # SQLALCHEMY
     # In production, set DATABASE_URL to your Postgres/MySQL string.
@@ -18,6 +34,80 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///db.sqlite3")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Read replicas: comma-separated URLs, registered as binds "replica_0", "replica_1", ...
+    # Only reads marked @replica_read use them, and never after the request has written.
+    SQLALCHEMY_REPLICA_URIS = [
+        uri.strip() for uri in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if uri.strip()
+    ]
+    SQLALCHEMY_BINDS = {f"replica_{i}": uri for i, uri in enumerate(SQLALCHEMY_REPLICA_URIS)}
+
+    # Connection pool (per worker process). pool_size/max_overflow don't apply to SQLite.
+    # A gthread worker runs at most GUNICORN_THREADS requests at once, so a larger pool only
+    # holds idle connections: the total is workers * (pool_size + max_overflow) per database.
+    SQLALCHEMY_POOL_SIZE = int(os.getenv("SQLALCHEMY_POOL_SIZE", os.getenv("GUNICORN_THREADS", "4")))
+    SQLALCHEMY_MAX_OVERFLOW = int(os.getenv("SQLALCHEMY_MAX_OVERFLOW", "1"))
+    SQLALCHEMY_POOL_PRE_PING = os.getenv("SQLALCHEMY_POOL_PRE_PING", "true").lower() == "true"
+    SQLALCHEMY_POOL_RECYCLE = int(os.getenv("SQLALCHEMY_POOL_RECYCLE", "1800"))  # seconds
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_pre_ping": SQLALCHEMY_POOL_PRE_PING,
+        "pool_recycle": SQLALCHEMY_POOL_RECYCLE,
+    }
+    if not SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
+        SQLALCHEMY_ENGINE_OPTIONS.update(
+            pool_size=SQLALCHEMY_POOL_SIZE, max_overflow=SQLALCHEMY_MAX_OVERFLOW
+        )
+
+    # Rate limiting (token buckets: rate is tokens per second, burst is bucket size)
+    # RATE_LIMIT_BACKEND is "memory" (per process) or "redis" (shared across workers).
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_CUSTOMER_RATE = float(os.getenv("RATE_LIMIT_CUSTOMER_RATE", "5"))
+    RATE_LIMIT_CUSTOMER_BURST = int(os.getenv("RATE_LIMIT_CUSTOMER_BURST", "20"))
+    RATE_LIMIT_GATEWAY_RATE = float(os.getenv("RATE_LIMIT_GATEWAY_RATE", "50"))
+    RATE_LIMIT_GATEWAY_BURST = int(os.getenv("RATE_LIMIT_GATEWAY_BURST", "100"))
+    # Gateway limits apply per account: each merchant's own gateway account gets its own
+    # bucket, and requests without a merchant share the deployment account's bucket.
+    # Per-gateway (rate, burst) overrides, e.g. {"paystack": (20.0, 40)}
+    RATE_LIMIT_GATEWAY_OVERRIDES = {}
+
+    # Metrics: counters served at GET /metrics for Prometheus, summed over gunicorn
+    # workers. The endpoint only exists when METRICS_TOKEN is set, and requires it.
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    # Tracing: fraction of requests to record spans for, and the threshold above which
+    # a request is logged as slow (with its span tree when sampled). 0 disables either.
+    TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "0"))
+    TRACING_SLOW_REQUEST_MS = float(os.getenv("TRACING_SLOW_REQUEST_MS", "0"))
+
+    # Multi-merchant gateway credentials: comma-separated Fernet keys (first one encrypts),
+    # how many configured per-merchant adapters each worker keeps, and how often a cached
+    # adapter is checked against its credentials (rotations reach every worker within it).
+    GATEWAY_CREDENTIALS_KEY = os.getenv("GATEWAY_CREDENTIALS_KEY", "")
+    GATEWAY_ADAPTER_CACHE_SIZE = int(os.getenv("GATEWAY_ADAPTER_CACHE_SIZE", "1000"))
+    GATEWAY_CREDENTIALS_RECHECK_SECONDS = float(os.getenv("GATEWAY_CREDENTIALS_RECHECK_SECONDS", "30"))
+
+    # Async /initiate: the gateway call is written to an outbox and made by
+    # `flask run-dispatcher` workers. Requests can opt in/out with {"async": bool}.
+    ASYNC_INITIATE = os.getenv("ASYNC_INITIATE", "false").lower() == "true"
+    OUTBOX_WORKERS = int(os.getenv("OUTBOX_WORKERS", "4"))
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "10"))
+    OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))  # seconds
+    OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "120"))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+    # Result callbacks for queued initiations are signed with CALLBACK_SIGNING_SECRET
+    # (callback_url is refused while it is unset). Callback hosts must be in
+    # CALLBACK_ALLOWED_HOSTS when set, else resolve only to public addresses.
+    CALLBACK_SIGNING_SECRET = os.getenv("CALLBACK_SIGNING_SECRET", "")
+    CALLBACK_ALLOWED_HOSTS = {
+        host.strip().lower() for host in os.getenv("CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()
+    }
+    CALLBACK_ALLOW_HTTP = os.getenv("CALLBACK_ALLOW_HTTP", "false").lower() == "true"  # local testing only
+
+    # In-process cache of recent transactions for verify/OTP polling (0 disables)
+    HOT_TXN_CACHE_SIZE = int(os.getenv("HOT_TXN_CACHE_SIZE", "50000"))
+    HOT_TXN_CACHE_TTL = float(os.getenv("HOT_TXN_CACHE_TTL", "600"))  # seconds
+
     # Paystack
     PAYSTACK_SECRET_KEY = os.getenv("PAYSTACK_SECRET_KEY")
     PAYSTACK_PAYMENT_CHARGE_ENDPOINT = os.getenv("PAYSTACK_PAYMENT_CHARGE_ENDPOINT")
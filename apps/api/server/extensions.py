@@ -1,9 +1,16 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager
 from flasgger import Swagger
+from server.utils.db_routing import RoutingSession
+from server.utils.rate_limit import RateLimiter
+from server.utils.jwt_cache import CachedJWTManager
+from server.utils.tracing import Tracer
+from server.utils.transaction_cache import TransactionCache
 
 # --------------------------------------------
 
-db = SQLAlchemy()
-jwt = JWTManager()
-swagger = Swagger()
\ No newline at end of file
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+jwt = CachedJWTManager()
+swagger = Swagger()
+limiter = RateLimiter()
+tracer = Tracer()
+txn_cache = TransactionCache()
\ No newline at end of file
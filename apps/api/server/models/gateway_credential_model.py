@@ -0,0 +1,19 @@
+from server.extensions import db
+from sqlalchemy import Column, Integer, DateTime, String, Text, UniqueConstraint
+from datetime import datetime
+
+# -------------------------------------------
+
+
+class GatewayCredential(db.Model):
+    """Per-merchant gateway credentials. Secrets are stored Fernet-encrypted."""
+
+    __table_args__ = (UniqueConstraint("merchant_id", "gateway"),)
+
+    id = Column(Integer, primary_key=True)
+    merchant_id = Column(Integer, nullable=False, index=True)
+    gateway = Column(String(32), nullable=False)
+    encrypted_secret = Column(Text, nullable=False)
+    base_url = Column(String(255), nullable=True)  # None uses the adapter's default
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
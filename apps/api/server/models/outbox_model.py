@@ -0,0 +1,28 @@
+from server.extensions import db
+from sqlalchemy.dialects.sqlite import JSON
+from sqlalchemy import Column, Integer, DateTime, String, Text, Index
+from datetime import datetime
+
+# -------------------------------------------
+
+
+class OutboxMessage(db.Model):
+    """Gateway call to be made by the dispatcher, written in the same commit as its Transaction."""
+
+    __table_args__ = (Index("ix_outbox_message_status_available_at", "status", "available_at"),)
+
+    id = Column(Integer, primary_key=True)
+    gateway_ref = Column(String(64), nullable=False, index=True)  # Transaction this call is for
+    kind = Column(String(32), nullable=False)  # initiate
+    payload = Column(JSON, nullable=False)  # Gateway call arguments
+    status = Column(
+        String(10), nullable=False, default="pending"
+    )  # pending, processing, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.now)  # Not picked before this
+    locked_until = Column(DateTime, nullable=True)  # Claim expiry, so crashed workers' rows are retried
+    callback_url = Column(String(512), nullable=True)
+    result = Column(JSON, nullable=True)  # Gateway response
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
+    processed_at = Column(DateTime, nullable=True)
@@ -16,4 +16,5 @@ class Transaction(db.Model):
     )  # pending, failed, "success"
     txn_metadata = Column(JSON, nullable=True)  # Unstructured JSON data
     customer_id = Column(Integer, db.ForeignKey("user.id"), nullable=False)
+    merchant_id = Column(Integer, nullable=True)  # None uses the deployment's own gateway account
     created_at = Column(DateTime, default=datetime.now)
\ No newline at end of file
@@ -11,4 +11,5 @@ class User(db.Model):
     id = Column(Integer, primary_key=True)
     email = Column(String(20), unique=True, nullable=False)
     password_hash = Column(String(120), nullable=False)
+    merchant_id = Column(Integer, nullable=True)  # Merchant whose gateway accounts this user charges through
     created_at = Column(DateTime, default=datetime.now)
\ No newline at end of file
@@ -0,0 +1,31 @@
+import hmac
+from flask import Blueprint, Response, current_app, jsonify, request
+from prometheus_client import CONTENT_TYPE_LATEST
+from server.utils.metrics import metrics
+
+# ------------------------------------------------------------------------------------------
+
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def export_metrics():
+    """
+    Prometheus scrape endpoint (registered only when METRICS_TOKEN is set)
+    ---
+    tags:
+      - Metrics
+    responses:
+      200:
+        description: Counters in the Prometheus text format
+      401:
+        description: The bearer token doesn't match METRICS_TOKEN
+    """
+
+    token = current_app.config["METRICS_TOKEN"]
+    provided = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not token or not hmac.compare_digest(provided.encode(), token.encode()):
+        return jsonify({"error": "Unauthorized", "status": 401}), 401
+
+    return Response(metrics.render_prometheus(), content_type=CONTENT_TYPE_LATEST)
@@ -1,30 +1,40 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from server.services.transaction_service import (
     create_transaction,
     list_customer_transactions,
     get_transaction_by_gateway_ref,
+    get_cached_transaction,
     update_transaction_status,
 )
 from server.models.user_model import User
-from server.services.payment_service import PaystackService, MoniepointService
+from server.services.gateway_registry import gateways
+from server.services.outbox_service import enqueue_initiate, get_outbox_message, validate_callback
 from server.utils.logger import logger
+from server.extensions import limiter
 
 # ------------------------------------------------------------------------------------------
 
 
 txn_bp = Blueprint("transaction", __name__)
 
-# Service Registry for dynamic gateway selection
-services = {
-    "paystack": PaystackService(),
-    "moniepoint": MoniepointService()
-}
 
+def _gateway_service(gateway, merchant_id):
+    """Returns (adapter, None), or (None, error response) saying why there is no adapter."""
+    if not gateways.supports(gateway):
+        logger.error("Unsupported gateway", extra_info={"gateway": gateway})
+        return None, (jsonify({"error": f"Unsupported gateway: {gateway}", "status": 400}), 400)
+
+    payment_service = gateways.get(gateway, merchant_id)
+    if not payment_service:
+        logger.error("No gateway credentials for merchant", extra_info={"gateway": gateway, "merchant_id": merchant_id})
+        return None, (jsonify({"error": f"No {gateway} credentials configured for this merchant", "status": 400}), 400)
+    return payment_service, None
 
 
 @txn_bp.route("/", methods=["POST"])
 @jwt_required()
+@limiter.limit_customer
 def create_txn():
     """
     Create a new transaction (Simulation)
@@ -69,6 +79,7 @@ def create_txn():
 
 @txn_bp.route("/", methods=["GET"])
 @jwt_required()
+@limiter.limit_customer
 def list_txns():
     """
     List transactions for the logged-in user
@@ -97,6 +108,7 @@ def list_txns():
 
 @txn_bp.route("/initiate", methods=["POST"])
 @jwt_required()
+@limiter.limit_customer
 def initiate_payment():
     """
     Initiate a Paystack payment charge
@@ -114,38 +126,88 @@ def initiate_payment():
                 type: integer
               metadata:
                 type: object
+              async:
+                type: boolean
+                description: Queue the gateway call and return 202 immediately (defaults to ASYNC_INITIATE)
+              callback_url:
+                type: string
+                description: https URL that receives the signed gateway result when the call is queued
     responses:
       200:
         description: Payment initialization response
+      400:
+        description: Invalid async flag or callback_url, or gateway not available
+      202:
+        description: Payment initiation queued; poll /initiate/{reference} or wait for the callback
     """
 
-    data = request.json()
+    data = request.json
     customer_id = int(get_jwt_identity())
     gateway = data.get("gateway", "paystack")
     logger.info("Payment initiation started", extra_info={"customer_id": customer_id, "gateway": gateway, "amount": data["amount"]})
-    
-    # 0. Get the correct service
-    payment_service = services.get(gateway)
-    if not payment_service:
-        logger.error("Unsupported gateway", extra_info={"gateway": gateway})
-        return jsonify({"error": f"Unsupported gateway: {gateway}", "status": 400}), 400
 
-    # Fetch user for email (required by Paystack and Moniepoint)
+    # Fetch user for email (required by Paystack and Moniepoint) and their merchant
     user = User.query.get(customer_id)
+    if not user:
+        return jsonify({"error": "User not found", "status": 404}), 404
+    merchant_id = user.merchant_id
+
+    # 0. Get the correct service (the user's merchant account when they belong to one)
+    payment_service, error = _gateway_service(gateway, merchant_id)
+    if error:
+        return error
 
-    # 1. Store pending transaction in our database
+    # Direct charges (card/bank) always run synchronously so card details are never persisted
+    bank = data.get("bank")
+    card = data.get("card")
+    queued = data.get("async", current_app.config["ASYNC_INITIATE"])
+    if not isinstance(queued, bool):
+        return jsonify({"error": "async must be a boolean", "status": 400}), 400
+    queued = queued and not (bank or card)
+
+    callback_url = data.get("callback_url") if queued else None
+    if callback_url is not None:
+        try:
+            validate_callback(callback_url)
+        except ValueError as exc:
+            return jsonify({"error": str(exc), "status": 400}), 400
+
+    # Queued calls take their gateway token in the dispatcher instead
+    if not queued:
+        rejected = limiter.check_gateway(gateway, merchant_id)
+        if rejected:
+            return rejected
+
+    def enqueue(txn):
+        enqueue_initiate(
+            txn.gateway_ref,
+            email=user.email,
+            amount=data["amount"],
+            metadata={"internal_gateway_ref": txn.gateway_ref},
+            callback_url=callback_url,
+        )
+
+    # 1. Store pending transaction in our database (with its outbox message when queued)
     txn = create_transaction(
         amount=data["amount"],
         gateway=gateway,
         customer_id=customer_id,
         txn_metadata=data.get("txn_metadata"),
+        merchant_id=merchant_id,
+        before_commit=enqueue if queued else None,
     )
 
+    if queued:
+        return jsonify(
+            {
+                "data": {"internal_gateway_ref": txn.gateway_ref, "status": txn.status},
+                "msg": "Payment initiation queued",
+                "status": 202,
+            }
+        ), 202
+
     # 2. Check if this is a direct charge (no-redirect flow)
     # If card or bank info is provided, we use the charge endpoint
-    bank = data.get("bank")
-    card = data.get("card")
-
     if bank or card:
         # Initialize direct charge
         payment_resp = payment_service.charge(
@@ -165,7 +227,7 @@ def initiate_payment():
 
     # 3. Update internal transaction status if response is immediate
     gateway_status = payment_resp.get("data", {}).get("status")
-    if gateway_status:
+    if gateway_status and gateway_status != txn.status:
         update_transaction_status(txn.gateway_ref, gateway_status)
 
     return jsonify(
@@ -180,9 +242,52 @@ def initiate_payment():
     )
 
 
+@txn_bp.route("/initiate/<reference>", methods=["GET"])
+@jwt_required()
+@limiter.limit_customer
+def initiate_status(reference):
+    """
+    Result of a queued payment initiation
+    ---
+    tags:
+      - Transactions
+    parameters:
+      in: path
+      name: reference
+      required: true
+      schema:
+        type: string
+    responses:
+      200:
+        description: Dispatch status, and the gateway response once done
+      404:
+        description: Queued initiation not found or unauthorized
+    """
+
+    customer_id = int(get_jwt_identity())
+    txn = get_transaction_by_gateway_ref(reference)
+    message = get_outbox_message(reference) if txn and txn.customer_id == customer_id else None
+    if not message:
+        return jsonify({"error": "Queued initiation not found", "status": 404}), 404
+
+    return jsonify(
+        {
+            "data": {
+                "internal_gateway_ref": reference,
+                "dispatch_status": message.status,
+                "transaction_status": txn.status,
+                "gateway_resp": message.result,
+                "error": message.last_error,
+            },
+            "msg": "Payment initiation status",
+            "status": 200,
+        }
+    )
+
 
 @txn_bp.route("/verify/<reference>", methods=["GET"])
 @jwt_required()
+@limiter.limit_customer
 def verify_payment(reference):
     """
     Verify payment via Paystack and update transaction status
@@ -204,22 +309,27 @@ def verify_payment(reference):
     customer_id = int(get_jwt_identity())
     logger.info("Payment verification requested", extra_info={"reference": reference, "customer_id": customer_id})
 
-    # Fetch transaction from DB and check ownership
-    txn = get_transaction_by_gateway_ref(reference)
+    # Fetch transaction (hot cache, then DB) and check ownership
+    txn = get_cached_transaction(reference)
     if not txn or txn.customer_id != customer_id:
         logger.warning("Transaction not found or unauthorized access", extra_info={"reference": reference, "customer_id": customer_id})
         return jsonify({"error": "Transaction not found", "status": 404})
 
     # Get the correct service
-    payment_service = services.get(txn.gateway)
-    if not payment_service:
-        return jsonify({"error": f"Unsupported gateway: {txn.gateway}", "status": 400}), 400
+    payment_service, error = _gateway_service(txn.gateway, txn.merchant_id)
+    if error:
+        return error
+
+    rejected = limiter.check_gateway(txn.gateway, txn.merchant_id)
+    if rejected:
+        return rejected
 
     payment_resp = payment_service.verify_payment(reference=reference)
 
     gateway_status = payment_resp.get("data", {}).get("status")
 
-    if gateway_status:
+    # Most polls see no change; skip the SELECT + commit when the known status already matches
+    if gateway_status and gateway_status != txn.status:
         update_transaction_status(reference, gateway_status)
 
     return jsonify(
@@ -237,6 +347,7 @@ def verify_payment(reference):
 
 @txn_bp.route("/submit-otp", methods=["POST"])
 @jwt_required()
+@limiter.limit_customer
 def submit_otp():
     """
     Submit OTP for a pending transaction
@@ -267,24 +378,28 @@ def submit_otp():
     customer_id = int(get_jwt_identity())
     logger.info("OTP submission requested", extra_info={"reference": reference, "customer_id": customer_id})
 
-    # 1. Fetch transaction from DB and verify ownership
-    txn = get_transaction_by_gateway_ref(reference)
+    # 1. Fetch transaction (hot cache, then DB) and verify ownership
+    txn = get_cached_transaction(reference)
     if not txn or txn.customer_id != customer_id:
         logger.warning("Transaction not found for OTP submission", extra_info={"reference": reference, "customer_id": customer_id})
         return jsonify({"error": "Transaction not found or unauthorized", "status": 404}), 404
 
     # 2. Get the correct service
-    payment_service = services.get(txn.gateway)
-    if not payment_service:
-        return jsonify({"error": f"Unsupported gateway: {txn.gateway}", "status": 400}), 400
+    payment_service, error = _gateway_service(txn.gateway, txn.merchant_id)
+    if error:
+        return error
+
+    rejected = limiter.check_gateway(txn.gateway, txn.merchant_id)
+    if rejected:
+        return rejected
 
     # 3. Submit OTP via the service
     payment_resp = payment_service.submit_otp(otp=otp, reference=reference)
     
     gateway_status = payment_resp.get("data", {}).get("status")
 
-    # 4. Update internal transaction status if the gateway provides one
-    if gateway_status:
+    # 4. Update internal transaction status if the gateway provides a new one
+    if gateway_status and gateway_status != txn.status:
         update_transaction_status(reference, gateway_status)
 
     return jsonify(
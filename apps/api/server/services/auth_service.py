@@ -26,4 +26,15 @@ def authenticated_user(email, password):
 
     if user and verify_password(password, user.password_hash):
         return user
-    return None
\ No newline at end of file
+    return None
+
+
+def set_user_merchant(email, merchant_id):
+    """Attach a user to a merchant (None detaches). Returns the user, or None if not found."""
+    user = User.query.filter_by(email=email).first()
+    if user is None:
+        return None
+
+    user.merchant_id = merchant_id
+    db.session.commit()
+    return user
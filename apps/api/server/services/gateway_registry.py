@@ -0,0 +1,182 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from flask import current_app
+from server.extensions import db
+from server.models.gateway_credential_model import GatewayCredential
+from server.services.payment_service import PaystackService, MoniepointService
+from server.utils.logger import logger
+from server.utils.metrics import metrics
+from server.utils.security import encrypt_secret, decrypt_secret
+
+# ------------------------------------------------------
+
+ADAPTERS = {
+    "paystack": PaystackService,
+    "moniepoint": MoniepointService,
+}
+
+# Evicted adapters may still be serving an in-flight call, so their connection
+# pools are closed only after this many seconds (longer than GATEWAY_TIMEOUT).
+RETIRE_GRACE_SECONDS = 60
+
+
+class _CachedAdapter:
+    __slots__ = ("adapter", "updated_at", "checked_at")
+
+    def __init__(self, adapter, updated_at):
+        self.adapter = adapter
+        self.updated_at = updated_at  # credential row's updated_at when the adapter was built
+        self.checked_at = time.monotonic()
+
+
+class GatewayRegistry:
+    """
+    Resolves the adapter for a (merchant, gateway) pair.
+
+    Requests without a merchant use the deployment's own adapters, configured from
+    the environment. Merchant adapters are built from their encrypted DB credentials
+    once and kept in a bounded LRU, so secrets aren't decrypted and HTTP pools aren't
+    rebuilt per request. Credentials can be rotated from any process (e.g. the CLI),
+    so a cached adapter is re-checked against the row's `updated_at` once every
+    GATEWAY_CREDENTIALS_RECHECK_SECONDS and rebuilt if it changed. Evicted adapters have their pools closed once their grace period
+    is over, checked on every lookup; `close()` closes everything at worker shutdown.
+    """
+
+    def __init__(self):
+        self._defaults = {}
+        self._adapters = OrderedDict()  # (merchant_id, gateway) -> _CachedAdapter
+        self._retired = deque()  # (retired_at, PaymentService), oldest first
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def supports(gateway):
+        return gateway in ADAPTERS
+
+    def get(self, gateway, merchant_id=None):
+        """Adapter for the gateway, or None if unsupported or the merchant has no credentials for it."""
+        adapter_cls = ADAPTERS.get(gateway)
+        if adapter_cls is None:
+            return None
+
+        if self._retired:
+            self._close(self._take_expired_retired())
+
+        if merchant_id is None:
+            with self._lock:
+                if gateway not in self._defaults:
+                    self._defaults[gateway] = adapter_cls()
+                return self._defaults[gateway]
+
+        key = (merchant_id, gateway)
+        with self._lock:
+            entry = self._adapters.get(key)
+            if entry is not None:
+                self._adapters.move_to_end(key)
+
+        if entry is not None:
+            now = time.monotonic()
+            recheck = current_app.config.get("GATEWAY_CREDENTIALS_RECHECK_SECONDS", 30)
+            if now - entry.checked_at < recheck:
+                metrics.incr("gateway_adapter_cache", result="hit")
+                return entry.adapter
+            updated_at = (
+                db.session.query(GatewayCredential.updated_at)
+                .filter_by(merchant_id=merchant_id, gateway=gateway)
+                .scalar()
+            )
+            if updated_at == entry.updated_at:
+                entry.checked_at = now
+                metrics.incr("gateway_adapter_cache", result="hit")
+                return entry.adapter
+            # Rotated or deleted since the adapter was built
+            metrics.incr("gateway_adapter_cache", result="stale")
+            self._retire(key, entry)
+
+        metrics.incr("gateway_adapter_cache", result="miss")
+        credential = GatewayCredential.query.filter_by(merchant_id=merchant_id, gateway=gateway).first()
+        if credential is None:
+            return None
+        adapter = adapter_cls(secret_key=decrypt_secret(credential.encrypted_secret), base_url=credential.base_url)
+        entry = _CachedAdapter(adapter, credential.updated_at)
+
+        max_size = current_app.config.get("GATEWAY_ADAPTER_CACHE_SIZE", 1000)
+        with self._lock:
+            existing = self._adapters.get(key)
+            if existing is not None and existing.updated_at == entry.updated_at:
+                # Another thread built it first; keep theirs
+                self._retired.append((time.monotonic(), adapter))
+                return existing.adapter
+            if existing is not None:
+                self._retired.append((time.monotonic(), existing.adapter))
+            self._adapters[key] = entry
+            while len(self._adapters) > max_size:
+                _, evicted = self._adapters.popitem(last=False)
+                self._retired.append((time.monotonic(), evicted.adapter))
+        return adapter
+
+    def invalidate(self, merchant_id, gateway):
+        """Drop a cached adapter, e.g. after its credentials change."""
+        with self._lock:
+            entry = self._adapters.pop((merchant_id, gateway), None)
+            if entry is not None:
+                self._retired.append((time.monotonic(), entry.adapter))
+
+    def _retire(self, key, entry):
+        # Only if no other thread has replaced it in the meantime
+        with self._lock:
+            if self._adapters.get(key) is entry:
+                del self._adapters[key]
+                self._retired.append((time.monotonic(), entry.adapter))
+
+    def close(self):
+        """Close every pooled connection (worker shutdown)."""
+        with self._lock:
+            adapters = list(self._defaults.values()) + [entry.adapter for entry in self._adapters.values()]
+            adapters += [adapter for _, adapter in self._retired]
+            self._defaults.clear()
+            self._adapters.clear()
+            self._retired.clear()
+        self._close(adapters)
+
+    def _take_expired_retired(self):
+        # Retired in time order, so the expired ones are at the front
+        cutoff = time.monotonic() - RETIRE_GRACE_SECONDS
+        expired = []
+        with self._lock:
+            while self._retired and self._retired[0][0] <= cutoff:
+                expired.append(self._retired.popleft()[1])
+        return expired
+
+    @staticmethod
+    def _close(adapters):
+        for adapter in adapters:
+            try:
+                adapter.close()
+            except Exception as exc:
+                logger.warning("Failed to close gateway adapter", extra_info={"error": str(exc)})
+
+
+def set_gateway_credentials(merchant_id, gateway, secret_key, base_url=None):
+    """
+    Create or replace a merchant's credentials for a gateway, stored encrypted.
+    This process's cached adapter is dropped now; other processes pick the change
+    up within GATEWAY_CREDENTIALS_RECHECK_SECONDS.
+    """
+    if gateway not in ADAPTERS:
+        raise ValueError(f"Unsupported gateway: {gateway}")
+
+    credential = GatewayCredential.query.filter_by(merchant_id=merchant_id, gateway=gateway).first()
+    if credential is None:
+        credential = GatewayCredential(merchant_id=merchant_id, gateway=gateway)
+        db.session.add(credential)
+    credential.encrypted_secret = encrypt_secret(secret_key)
+    credential.base_url = base_url
+    db.session.commit()
+
+    gateways.invalidate(merchant_id, gateway)
+    return credential
+
+
+# Global registry, one per worker process
+gateways = GatewayRegistry()
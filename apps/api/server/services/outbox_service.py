@@ -0,0 +1,240 @@
+import json
+import threading
+from datetime import datetime, timedelta
+import httpx
+from flask import current_app
+from sqlalchemy import and_, or_, update
+from server.extensions import db, limiter
+from server.models.outbox_model import OutboxMessage
+from server.services.gateway_registry import gateways
+from server.services.transaction_service import get_transaction_by_gateway_ref, update_transaction_status
+from server.utils.callbacks import SIGNATURE_HEADER, pin_callback_url, sign_callback, validate_callback_url
+from server.utils.logger import logger
+from server.utils.metrics import metrics
+
+# ------------------------------------------------------
+# Outbox dispatch for async /initiate. The route commits the pending Transaction
+# and its OutboxMessage together and returns 202; dispatcher workers claim
+# messages, call the gateway, and store the result for polling/callbacks.
+
+
+def enqueue_initiate(gateway_ref, email, amount, metadata=None, callback_url=None):
+    """Add an initiate message to the session. The caller commits it with the Transaction."""
+    message = OutboxMessage(
+        gateway_ref=gateway_ref,
+        kind="initiate",
+        payload={"email": email, "amount": amount, "metadata": metadata or {}},
+        status="pending",
+        attempts=0,
+        available_at=datetime.now(),
+        callback_url=callback_url,
+    )
+    db.session.add(message)
+    return message
+
+
+def get_outbox_message(gateway_ref, kind="initiate"):
+    return OutboxMessage.query.filter_by(gateway_ref=gateway_ref, kind=kind).first()
+
+
+def _claimable(now):
+    # Pending and due, or claimed by a worker whose claim has expired (crashed mid-call)
+    return or_(
+        and_(OutboxMessage.status == "pending", OutboxMessage.available_at <= now),
+        and_(OutboxMessage.status == "processing", OutboxMessage.locked_until < now),
+    )
+
+
+def claim_batch(batch_size, lease_seconds):
+    """
+    Claim up to `batch_size` due messages for this worker.
+    Postgres uses FOR UPDATE SKIP LOCKED so concurrent workers never block on each
+    other; other databases (SQLite) fall back to a conditional UPDATE per row.
+    """
+    now = datetime.now()
+    locked_until = now + timedelta(seconds=lease_seconds)
+
+    if db.engine.dialect.name == "postgresql":
+        messages = (
+            OutboxMessage.query.filter(_claimable(now))
+            .order_by(OutboxMessage.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for message in messages:
+            message.status = "processing"
+            message.locked_until = locked_until
+        db.session.commit()
+        return messages
+
+    candidates = [
+        row.id
+        for row in db.session.query(OutboxMessage.id)
+        .filter(_claimable(now))
+        .order_by(OutboxMessage.id)
+        .limit(batch_size)
+    ]
+    claimed = []
+    for message_id in candidates:
+        result = db.session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id == message_id, _claimable(now))
+            .values(status="processing", locked_until=locked_until)
+        )
+        if result.rowcount == 1:
+            claimed.append(message_id)
+    db.session.commit()
+    if not claimed:
+        return []
+    return OutboxMessage.query.filter(OutboxMessage.id.in_(claimed)).order_by(OutboxMessage.id).all()
+
+
+def dispatch_message(message, max_attempts):
+    """Make the gateway call for one claimed message and record the outcome."""
+    txn = get_transaction_by_gateway_ref(message.gateway_ref)
+    payment_service = gateways.get(txn.gateway, txn.merchant_id) if txn else None
+    if payment_service is None:
+        _finish(message, "failed", error="Transaction or gateway not available")
+        return
+
+    allowed, retry_after = limiter.acquire_gateway(txn.gateway, txn.merchant_id)
+    if not allowed:
+        # Gateway quota spent: put it back without counting an attempt
+        message.status = "pending"
+        message.available_at = datetime.now() + timedelta(seconds=retry_after)
+        db.session.commit()
+        return
+
+    message.attempts += 1
+    try:
+        payment_resp = payment_service.initialize_charge(**message.payload)
+    except Exception as exc:
+        if message.attempts >= max_attempts:
+            _finish(message, "failed", error=str(exc))
+        else:
+            message.status = "pending"
+            message.last_error = str(exc)
+            message.available_at = datetime.now() + timedelta(seconds=2**message.attempts)
+            db.session.commit()
+        logger.error(
+            "Outbox gateway call failed",
+            extra_info={"gateway_ref": message.gateway_ref, "attempts": message.attempts, "error": str(exc)},
+        )
+        return
+
+    _finish(message, "done", result=payment_resp)
+
+
+def _finish(message, status, result=None, error=None):
+    message.status = status
+    message.result = result
+    message.last_error = error
+    message.locked_until = None
+    message.processed_at = datetime.now()
+    metrics.incr("outbox_messages", kind=message.kind, status=status)
+
+    # Commits the message together with the transaction's status
+    gateway_status = ((result or {}).get("data") or {}).get("status") if status == "done" else "failed"
+    if gateway_status:
+        update_transaction_status(message.gateway_ref, gateway_status)
+    else:
+        db.session.commit()
+
+    if message.callback_url:
+        _send_callback(message, gateway_status)
+
+
+def validate_callback(url):
+    """Raise ValueError unless callbacks are enabled and `url` may receive them; returns the address to use."""
+    config = current_app.config
+    if not config["CALLBACK_SIGNING_SECRET"]:
+        raise ValueError("callback_url is not enabled on this server")
+    return validate_callback_url(url, config["CALLBACK_ALLOWED_HOSTS"], config["CALLBACK_ALLOW_HTTP"])
+
+
+def _send_callback(message, gateway_status):
+    # Checked again at send time: the host may resolve differently than when it was stored
+    try:
+        address = validate_callback(message.callback_url)
+    except ValueError as exc:
+        logger.warning("Outbox callback refused", extra_info={"gateway_ref": message.gateway_ref, "error": str(exc)})
+        return
+
+    body = json.dumps(
+        {
+            "internal_gateway_ref": message.gateway_ref,
+            "status": message.status,
+            "gateway_status": gateway_status,
+            "gateway_resp": message.result,
+            "error": message.last_error,
+        },
+        separators=(",", ":"),
+    ).encode()
+    # Sent to the address just checked, never to a fresh lookup of the host
+    url, headers, extensions = pin_callback_url(message.callback_url, address)
+    headers.update(
+        {
+            "Content-Type": "application/json",
+            SIGNATURE_HEADER: sign_callback(body, current_app.config["CALLBACK_SIGNING_SECRET"]),
+        }
+    )
+    try:
+        with httpx.Client(timeout=5, follow_redirects=False) as client:
+            client.post(url, content=body, headers=headers, extensions=extensions)
+    except httpx.HTTPError as exc:
+        logger.warning(
+            "Outbox callback failed", extra_info={"gateway_ref": message.gateway_ref, "error": str(exc)}
+        )
+
+
+class Dispatcher:
+    """Pool of worker threads draining the outbox. Run it with `flask run-dispatcher`."""
+
+    def __init__(self, app):
+        self.app = app
+        self.workers = app.config.get("OUTBOX_WORKERS", 4)
+        self.batch_size = app.config.get("OUTBOX_BATCH_SIZE", 10)
+        self.poll_interval = app.config.get("OUTBOX_POLL_INTERVAL", 1.0)
+        self.lease_seconds = app.config.get("OUTBOX_LEASE_SECONDS", 120)
+        self.max_attempts = app.config.get("OUTBOX_MAX_ATTEMPTS", 5)
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"outbox-dispatcher-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Outbox dispatcher started", extra_info={"workers": self.workers})
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        gateways.close()
+
+    def run_once(self):
+        """Claim and dispatch one batch. Returns how many messages were processed."""
+        with self.app.app_context():
+            messages = claim_batch(self.batch_size, self.lease_seconds)
+            for message in messages:
+                try:
+                    dispatch_message(message, self.max_attempts)
+                except Exception as exc:
+                    # Leave it claimed; the lease expiry hands it to another attempt
+                    db.session.rollback()
+                    logger.error(
+                        "Outbox dispatch error", extra_info={"gateway_ref": message.gateway_ref, "error": str(exc)}
+                    )
+            return len(messages)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as exc:
+                logger.error("Outbox worker error", extra_info={"error": str(exc)})
+                processed = 0
+            if not processed:
+                self._stop.wait(self.poll_interval)
@@ -0,0 +1,286 @@
+from abc import ABC, abstractmethod
+import os
+import httpx
+from server.utils.batching import MicroBatcher
+from server.utils.http_client import GatewayHTTPClient
+from server.utils.logger import logger
+from server.utils.tracing import traced
+
+# --------------------------------------
+
+
+class PaymentService(ABC):
+    """Base class for all payment gateways."""
+
+    GATEWAY_METHODS = ("initialize_charge", "verify_payment", "submit_otp", "charge")
+
+    def __init_subclass__(cls, **kwargs):
+        # Trace every gateway call as a "gateway" span, for current and future adapters
+        super().__init_subclass__(**kwargs)
+        for name in cls.GATEWAY_METHODS:
+            if name in cls.__dict__:
+                setattr(cls, name, traced("gateway", f"{cls.__name__}.{name}")(cls.__dict__[name]))
+
+    @staticmethod
+    def build_http_client():
+        """
+        Pooled HTTP client shared by all calls to one gateway, safe to use from every
+        request thread. With GATEWAY_HTTP2 (negotiated over TLS, falling back to
+        HTTP/1.1), concurrent requests are multiplexed as streams over a few
+        connections instead of opening one connection each.
+        """
+        max_connections = int(os.getenv("GATEWAY_MAX_CONNECTIONS", "10"))
+        return GatewayHTTPClient(
+            http2=os.getenv("GATEWAY_HTTP2", "true").lower() == "true",
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            timeout=float(os.getenv("GATEWAY_TIMEOUT", "30")),
+        )
+
+    def verify_payments(self, references):
+        """Verify several references. Gateways with a bulk endpoint override this."""
+        return {reference: self.verify_payment(reference) for reference in references}
+
+    def close(self):
+        """Close pooled gateway connections."""
+        self.http.close()
+
+    @abstractmethod
+    def initialize_charge(self, **kwargs):
+        """Initialize payment charge"""
+        pass
+
+    @abstractmethod
+    def verify_payment(self, reference):
+        """Verify payment status"""
+        pass
+
+    @abstractmethod
+    def submit_otp(self, otp, reference):
+        """Submit OTP for payment authorization"""
+        pass
+
+    @abstractmethod
+    def charge(self, **kwargs):
+        """Handle direct charges (card/bank/account)."""
+        pass
+
+
+class PaystackService(PaymentService):
+    """Payment initialization and verification for Paystack charge"""
+
+    def __init__(self, secret_key=None, base_url=None):
+        # Paystack secret key: a merchant's own, or the deployment's from environment
+        self.secret_key = secret_key or os.getenv("PAYSTACK_SECRET_KEY")
+        # Base URL for Paystack API
+        self.base_url = base_url or os.getenv("PAYSTACK_BASE_URL", "https://api.paystack.co")
+        self.http = self.build_http_client()
+        # Coalesce concurrent verifications into one transaction list call (off by default)
+        self.verify_batcher = None
+        if os.getenv("PAYSTACK_BATCH_VERIFY", "false").lower() == "true":
+            self.verify_batcher = MicroBatcher(
+                self.verify_payments,
+                max_batch=int(os.getenv("PAYSTACK_BATCH_VERIFY_SIZE", "50")),
+                max_wait=float(os.getenv("PAYSTACK_BATCH_VERIFY_WAIT_MS", "10")) / 1000,
+            )
+
+    def initialize_charge(self, email, amount, metadata=None):
+        """
+        Initialize a transaction with Paystack.
+        Amount should be in kobo. Email is required.
+        """
+        url = f"{self.base_url}/transaction/initialize"
+        headers = {
+            "Authorization": f"Bearer {self.secret_key}",
+            "Content-type": "application/json",
+        }
+
+        payload = {"email": email, "amount": amount, "metadata": metadata or {}}
+        logger.info("Initializing Paystack charge", extra_info={"email": email, "amount": amount})
+        resp = self.http.post(url, json=payload, headers=headers)
+        return resp.json()
+
+    def verify_payment(self, reference):
+        """
+        Verify transaction status by its reference.
+        """
+        if self.verify_batcher is not None:
+            return self.verify_batcher.submit(reference)
+        return self._verify_one(reference)
+
+    def verify_payments(self, references):
+        """
+        Bulk verification through the transaction list endpoint.
+        Paystack has no filter by reference, so recent transactions are listed and
+        matched on `reference` or our `internal_gateway_ref` metadata; anything not
+        found on that page is verified individually, concurrently on the pooled
+        client's event loop (no extra threads). A failed individual verification is
+        returned as its exception.
+        """
+        url = f"{self.base_url}/transaction"
+        headers = {"Authorization": f"Bearer {self.secret_key}"}
+        params = {"perPage": max(100, 2 * len(references))}
+        logger.info("Bulk verifying Paystack payments", extra_info={"count": len(references)})
+        resp = self.http.get(url, headers=headers, params=params).json()
+
+        wanted = set(references)
+        results = {}
+        # The list is newest first: keep the first match, so a retried charge with the
+        # same internal_gateway_ref reports its latest attempt, not a stale one
+        for txn in resp.get("data") or []:
+            metadata = txn.get("metadata") if isinstance(txn.get("metadata"), dict) else {}
+            for key in (txn.get("reference"), metadata.get("internal_gateway_ref")):
+                if key in wanted and key not in results:
+                    results[key] = {"status": True, "message": "Verification successful", "data": txn}
+
+        misses = [reference for reference in references if reference not in results]
+        if misses:
+            logger.info("Verifying Paystack payments missing from list", extra_info={"count": len(misses)})
+            requests = [
+                self.http.build_request("GET", f"{self.base_url}/transaction/verify/{reference}", headers=headers)
+                for reference in misses
+            ]
+            for reference, resp in zip(misses, self.http.send_all(requests)):
+                if isinstance(resp, Exception):
+                    results[reference] = resp
+                    continue
+                try:
+                    results[reference] = resp.json()
+                except ValueError as exc:
+                    results[reference] = exc
+        return results
+
+    def _verify_one(self, reference):
+        url = f"{self.base_url}/transaction/verify/{reference}"
+        headers = {"Authorization": f"Bearer {self.secret_key}"}
+        # GET request for verification per Paystack docs
+        logger.info("Verifying Paystack payment", extra_info={"reference": reference})
+        resp = self.http.get(url, headers=headers)
+
+        return resp.json()
+
+    def submit_otp(self, otp, reference):
+        """
+        Submit OTP to authorize a charge.
+        Typically used in the 'no-redirect' flow.
+        """
+        url = f"{self.base_url}/charge/submit_otp"
+        headers = {
+            "Authorization": f"Bearer {self.secret_key}",
+            "Content-type": "application/json",
+        }
+
+        payload = {"otp": otp, "reference": reference}
+        logger.info("Submitting Paystack OTP", extra_info={"reference": reference})
+        resp = self.http.post(url, json=payload, headers=headers)
+        return resp.json()
+
+    def charge(self, email, amount, bank=None, card=None, metadata=None):
+        """
+        Direct charge for card or bank account.
+        This is the entry point for 'no-redirect' flows.
+        """
+        url = f"{self.base_url}/charge"
+        headers = {
+            "Authorization": f"Bearer {self.secret_key}",
+            "Content-type": "application/json",
+        }
+
+        payload = {
+            "email": email,
+            "amount": amount,
+            "metadata": metadata or {}
+        }
+        
+        # Add bank or card details if provided
+        if bank:
+            payload["bank"] = bank
+        if card:
+            payload["card"] = card
+
+        logger.info("Direct charging Paystack", extra_info={"email": email, "amount": amount})
+        resp = self.http.post(url, json=payload, headers=headers)
+        return resp.json()
+
+
+class MoniepointService(PaymentService):
+    """Payment initialization and verification for Moniepoint charge"""
+
+    def __init__(self, secret_key=None, base_url=None):
+        # Moniepoint secret key: a merchant's own, or the deployment's from environment
+        self.secret_key = secret_key or os.getenv("MONIEPOINT_SECRET_KEY")
+        # Base URL for Moniepoint API
+        self.base_url = base_url or os.getenv("MONIEPOINT_BASE_URL", "https://api.moniepoint.com/v1")
+        self.http = self.build_http_client()
+
+    def initialize_charge(self, email, amount, metadata=None):
+        """
+        Initialize a transaction with Moniepoint.
+        """
+        url = f"{self.base_url}/payments/initialize"
+        headers = {
+            "Authorization": f"Bearer {self.secret_key}",
+            "Content-type": "application/json",
+        }
+
+        # Moniepoint specific payload structure (Simulated)
+        payload = {
+            "customerEmail": email,
+            "amount": amount,
+            "metaData": metadata or {},
+            "currency": "NGN"
+        }
+        logger.info("Initializing Moniepoint charge", extra_info={"email": email, "amount": amount})
+        resp = self.http.post(url, json=payload, headers=headers)
+        return resp.json()
+
+    def verify_payment(self, reference):
+        """
+        Verify Moniepoint transaction status.
+        """
+        url = f"{self.base_url}/payments/verify/{reference}"
+        headers = {"Authorization": f"Bearer {self.secret_key}"}
+        logger.info("Verifying Moniepoint payment", extra_info={"reference": reference})
+        resp = self.http.get(url, headers=headers)
+
+        return resp.json()
+
+    def submit_otp(self, otp, reference):
+        """
+        Submit OTP for Moniepoint (Simulated endpoint).
+        """
+        url = f"{self.base_url}/payments/submit-otp"
+        headers = {
+            "Authorization": f"Bearer {self.secret_key}",
+            "Content-type": "application/json",
+        }
+
+        payload = {"otp": otp, "transactionReference": reference}
+        resp = self.http.post(url, json=payload, headers=headers)
+        return resp.json()
+
+    def charge(self, email, amount, bank=None, card=None, metadata=None):
+        """
+        Direct charge for Moniepoint (Simulated).
+        """
+        url = f"{self.base_url}/payments/charge"
+        headers = {
+            "Authorization": f"Bearer {self.secret_key}",
+            "Content-type": "application/json",
+        }
+
+        payload = {
+            "email": email,
+            "amount": amount,
+            "metadata": metadata or {}
+        }
+        
+        if bank:
+            payload["bankDetails"] = bank
+        if card:
+            payload["cardDetails"] = card
+
+        logger.info("Direct charging Moniepoint", extra_info={"email": email, "amount": amount})
+        resp = self.http.post(url, json=payload, headers=headers)
+        return resp.json()
\ No newline at end of file
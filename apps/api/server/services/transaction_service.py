@@ -0,0 +1,101 @@
+from sqlalchemy.exc import IntegrityError
+from server.extensions import db, txn_cache
+from server.models.transaction_model import Transaction
+from server.utils.db_routing import replica_read
+from server.utils.reference import generate_reference, reference_bounds
+from server.utils.tracing import traced
+
+# ------------------------------------------------------
+
+MAX_REFERENCE_ATTEMPTS = 3
+
+
+@traced("db")
+def create_transaction(amount, gateway, customer_id, txn_metadata=None, merchant_id=None, before_commit=None):
+    """
+    `before_commit(txn)` may add related rows (e.g. an outbox message) to the
+    session so they are committed atomically with the transaction.
+    """
+    # References are collision-resistant, but a duplicate must never surface as a 500
+    for attempt in range(MAX_REFERENCE_ATTEMPTS):
+        txn = Transaction(
+            gateway_ref=generate_reference(),
+            amount=amount,
+            gateway=gateway,
+            status="pending",
+            customer_id=customer_id,
+            merchant_id=merchant_id,
+            txn_metadata=txn_metadata or {},
+        )
+        db.session.add(txn)
+        if before_commit is not None:
+            before_commit(txn)
+        try:
+            db.session.commit()
+            txn_cache.put(txn)
+            return txn
+        except IntegrityError as exc:
+            db.session.rollback()
+            # Anything else (e.g. an unknown customer_id) fails the same way on every attempt
+            if not _is_reference_collision(exc) or attempt == MAX_REFERENCE_ATTEMPTS - 1:
+                raise
+
+
+def _is_reference_collision(exc):
+    """True if the IntegrityError is the unique constraint on transaction.gateway_ref."""
+    message = str(exc.orig).lower()
+    return "gateway_ref" in message and ("unique" in message or "duplicate" in message)
+
+
+@traced("db")
+def get_transaction_by_gateway_ref(gateway_ref):
+    return Transaction.query.filter_by(gateway_ref=gateway_ref).first()
+
+
+def get_cached_transaction(gateway_ref):
+    """
+    Compact snapshot (gateway_ref, customer_id, merchant_id, gateway, status, amount)
+    from the hot cache, falling back to the DB. Not an ORM instance; use
+    get_transaction_by_gateway_ref to modify a transaction.
+    """
+    cached = txn_cache.get(gateway_ref)
+    if cached is not None:
+        return cached
+    txn = get_transaction_by_gateway_ref(gateway_ref)
+    if txn is None:
+        return None
+    # put() returns None when the cache is disabled
+    return txn_cache.put(txn) or txn
+
+
+@traced("db")
+@replica_read
+def list_customer_transactions(customer_id):
+    return (
+        Transaction.query.filter_by(customer_id=customer_id)
+        .order_by(Transaction.created_at.desc())
+        .all()
+    )
+
+
+@traced("db")
+@replica_read
+def list_transactions_between(start, end, customer_id=None):
+    """Transactions created in [start, end], found by an index range scan on gateway_ref."""
+    low, high = reference_bounds(start, end)
+    query = Transaction.query.filter(Transaction.gateway_ref.between(low, high))
+    if customer_id is not None:
+        query = query.filter_by(customer_id=customer_id)
+    return query.order_by(Transaction.gateway_ref).all()
+
+
+@traced("db")
+def update_transaction_status(gateway_ref, status):
+    txn = get_transaction_by_gateway_ref(gateway_ref)
+
+    if txn:
+        txn.status = status
+        db.session.commit()
+        txn_cache.set_status(gateway_ref, status)
+
+    return txn
\ No newline at end of file
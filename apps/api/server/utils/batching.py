@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import Future
+
+# ------------------------------------------------------
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item calls into one bulk call.
+
+    The first caller in a window becomes the leader: it waits up to `max_wait`
+    seconds (or until `max_batch` keys are queued), then calls `fn(keys)` once
+    for everyone. `fn` must return a dict of key -> result; keys it leaves out
+    raise KeyError for their callers, and exception values are raised only for
+    their own key. Identical keys in the same window share one result, so
+    polling clients hitting the same reference are deduplicated.
+    """
+
+    def __init__(self, fn, max_batch=50, max_wait=0.01):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> Future
+        self._collecting = False
+        self._full = threading.Event()
+
+    def submit(self, key):
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = Future()
+            leader = not self._collecting
+            if leader:
+                self._collecting = True
+                self._full.clear()
+            elif len(self._pending) >= self.max_batch:
+                self._full.set()
+
+        if leader:
+            self._full.wait(self.max_wait)
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._collecting = False
+            self._run(batch)
+
+        return future.result()
+
+    def _run(self, batch):
+        try:
+            results = self.fn(list(batch))
+        except Exception as exc:
+            for future in batch.values():
+                future.set_exception(exc)
+            return
+
+        for key, future in batch.items():
+            if key not in results:
+                future.set_exception(KeyError(key))
+            elif isinstance(results[key], Exception):
+                future.set_exception(results[key])
+            else:
+                future.set_result(results[key])
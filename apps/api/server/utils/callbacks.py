@@ -0,0 +1,78 @@
+import hashlib
+import hmac
+import ipaddress
+import socket
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+# ------------------------------------------------------
+# Client-supplied callback URLs for async /initiate results. URLs are checked
+# before they are stored and again before each POST (DNS can change in between),
+# the POST connects to the address that passed the check rather than resolving the
+# host again, and every body is signed so receivers can authenticate it.
+
+SIGNATURE_HEADER = "X-Kurudu-Signature"
+
+
+def validate_callback_url(url, allowed_hosts=(), allow_http=False):
+    """
+    Raise ValueError unless `url` is safe for the server to POST to, else return the
+    address to connect to. With `allowed_hosts`, the host must be one of them. Otherwise
+    every address the host resolves to must be public, so callbacks can't reach
+    internal services.
+    """
+    if not isinstance(url, str) or len(url) > 512:
+        raise ValueError("callback_url must be a URL of at most 512 characters")
+
+    parts = urlsplit(url)
+    schemes = ("https", "http") if allow_http else ("https",)
+    if parts.scheme not in schemes:
+        raise ValueError("callback_url must use https")
+    if not parts.hostname or parts.username or parts.password:
+        raise ValueError("callback_url must have a host and no credentials")
+
+    host = parts.hostname.lower()
+    if allowed_hosts and host not in allowed_hosts:
+        raise ValueError("callback_url host is not allowed")
+
+    try:
+        infos = socket.getaddrinfo(host, parts.port or 443, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        raise ValueError("callback_url host does not resolve")
+    addresses = list(dict.fromkeys(info[4][0].split("%")[0] for info in infos))
+    if not addresses:
+        raise ValueError("callback_url host does not resolve")
+    if not allowed_hosts:
+        for address in addresses:
+            if not ipaddress.ip_address(address).is_global:
+                raise ValueError("callback_url must point to a public address")
+    return addresses[0]
+
+
+def pin_callback_url(url, address):
+    """
+    Request URL, headers and httpx extensions that send a POST for `url` to the
+    already-checked `address`: the host is replaced by the address, and the original
+    host goes in the Host header and the TLS SNI (so the certificate is still
+    verified against it). Nothing is resolved again, so a host that re-binds to an
+    internal address after validation can't redirect the callback.
+    """
+    parts = urlsplit(url)
+    literal = f"[{address}]" if ipaddress.ip_address(address).version == 6 else address
+    netloc = f"{literal}:{parts.port}" if parts.port else literal
+    return (
+        urlunsplit(parts._replace(netloc=netloc)),
+        {"Host": parts.netloc},
+        {"sni_hostname": parts.hostname},
+    )
+
+
+def sign_callback(body, secret, timestamp=None):
+    """
+    Signature header value for a callback body (bytes): `t=<unix seconds>,v1=<hex>`,
+    where v1 is HMAC-SHA256(secret, "<t>." + body). Receivers recompute it and
+    reject stale timestamps to stop replays.
+    """
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
@@ -0,0 +1,48 @@
+import random
+from functools import wraps
+import sqlalchemy as sa
+from flask import current_app
+from flask_sqlalchemy.session import Session
+
+# ------------------------------------------------------
+# Read-replica routing. Everything goes to the primary unless a read is wrapped
+# in `@replica_read`, and even then the primary is used once the request's
+# session has written anything, so a request always reads its own writes.
+
+REPLICA_BIND_PREFIX = "replica_"
+
+
+class RoutingSession(Session):
+    """Session that sends `@replica_read` queries to a replica bind until the first write."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+        if self._flushing or isinstance(clause, sa.UpdateBase):
+            self.info["wrote"] = True
+            return engine
+        if not self.info.get("replica_read") or self.info.get("wrote"):
+            return engine
+
+        engines = self._db.engines
+        if engine is not engines.get(None):
+            # Only the default bind has replicas
+            return engine
+        replicas = [e for key, e in engines.items() if key and key.startswith(REPLICA_BIND_PREFIX)]
+        return random.choice(replicas) if replicas else engine
+
+
+def replica_read(fn):
+    """Run the function's queries against a read replica (when configured and nothing was written yet)."""
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        session = current_app.extensions["sqlalchemy"].session()
+        previous = session.info.get("replica_read", False)
+        session.info["replica_read"] = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            session.info["replica_read"] = previous
+
+    return wrapper
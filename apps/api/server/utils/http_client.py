@@ -0,0 +1,81 @@
+import asyncio
+import os
+import threading
+import httpx
+
+# ------------------------------------------------------
+# Gateway HTTP runs on one asyncio event loop per process, in a background thread.
+# Request threads submit coroutines to it and block on the result, so every
+# connection is only ever driven by that one thread. httpcore's sync HTTP/2
+# connection assigns stream ids without a lock and can't be shared between
+# threads; its async one can be shared by any number of tasks on one loop.
+
+
+class _LoopThread:
+    """The process's gateway event loop, started on first use (and again in a forked child)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop = None
+        self._pid = None
+
+    def _get_loop(self):
+        loop = self._loop
+        if loop is not None and self._pid == os.getpid():
+            return loop
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                # A loop inherited over fork has no thread running it in this process
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                threading.Thread(target=self._loop.run_forever, name="gateway-http", daemon=True).start()
+            return self._loop
+
+    def run(self, coro):
+        """Run `coro` on the loop and wait for its result (or exception)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+
+_loop_thread = _LoopThread()
+
+
+class GatewayHTTPClient:
+    """
+    Blocking, thread-safe client over an httpx.AsyncClient on the gateway loop.
+    Takes httpx.AsyncClient's arguments; with http2=True concurrent calls from any
+    thread are multiplexed as streams over the pooled connections.
+    """
+
+    def __init__(self, **kwargs):
+        self._client = httpx.AsyncClient(**kwargs)
+
+    def request(self, method, url, **kwargs):
+        return _loop_thread.run(self._client.request(method, url, **kwargs))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def build_request(self, method, url, **kwargs):
+        return self._client.build_request(method, url, **kwargs)
+
+    def send_all(self, requests):
+        """
+        Send built requests concurrently and wait for all of them. Returns their
+        responses in order, with the exception in place of any request that failed.
+        """
+
+        async def send_all():
+            return await asyncio.gather(*(self._client.send(request) for request in requests), return_exceptions=True)
+
+        return _loop_thread.run(send_all())
+
+    @property
+    def is_closed(self):
+        return self._client.is_closed
+
+    def close(self):
+        if not self._client.is_closed:
+            _loop_thread.run(self._client.aclose())
@@ -0,0 +1,100 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask_jwt_extended import JWTManager
+from server.utils.metrics import metrics
+
+# ------------------------------------------------------
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified token -> claims, keyed by the SHA-256 of the token
+    so raw bearer tokens are never held in memory as dict keys.
+    Entries are dropped once their `exp` passes, so a cached token can never
+    outlive the expiry a full decode would enforce.
+    """
+
+    def __init__(self, max_size=10_000, sweep_interval=60):
+        self.max_size = max_size
+        self.sweep_interval = sweep_interval
+        self._entries = OrderedDict()  # digest -> (exp, claims)
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+
+    @staticmethod
+    def key(encoded_token):
+        return hashlib.sha256(encoded_token.encode()).digest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            exp, claims = entry
+            if exp is not None and exp <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def set(self, key, claims):
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (claims.get("exp"), claims)
+            self._entries.move_to_end(key)
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep_expired(now)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _sweep_expired(self, now):
+        """Drop every expired entry. Throttled so it never runs on each insert."""
+        expired = [k for k, (exp, _) in self._entries.items() if exp is not None and exp <= now]
+        for k in expired:
+            del self._entries[k]
+        self._last_sweep = now
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CachedJWTManager(JWTManager):
+    """
+    JWTManager that skips signature verification for tokens it has already verified.
+
+    `@jwt_required()` still runs its usual checks (token type, freshness, blocklist);
+    only the decode + signature step is served from the cache. Tokens that need a CSRF
+    check or are decoded with `allow_expired` always take the full path.
+    Set `JWT_DECODE_CACHE_SIZE = 0` to disable the cache.
+    """
+
+    def __init__(self, app=None, add_context_processor=False):
+        self.token_cache = None
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app, add_context_processor=False):
+        super().init_app(app, add_context_processor)
+        size = app.config.get("JWT_DECODE_CACHE_SIZE", 10_000)
+        self.token_cache = TokenCache(size) if size else None
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        if self.token_cache is None or csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        key = TokenCache.key(encoded_token)
+        claims = self.token_cache.get(key)
+        if claims is not None:
+            metrics.incr("jwt_decode_cache", result="hit")
+            return dict(claims)
+
+        metrics.incr("jwt_decode_cache", result="miss")
+        claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        self.token_cache.set(key, claims)
+        return dict(claims)
@@ -2,6 +2,7 @@ import logging
 import json
 import datetime
 from flask import request, has_request_context
+from server.utils.tracing import span
 
 # ------------------------------------------------------
 
@@ -11,6 +12,10 @@ class JsonFormatter(logging.Formatter):
     Includes request metadata if available.
     """
     def format(self, record):
+        with span("log.format", layer="logging"):
+            return self._format(record)
+
+    def _format(self, record):
         log_record = {
             "timestamp": datetime.datetime.utcnow().isoformat(),
             "level": record.levelname,
@@ -39,6 +44,17 @@ class JsonFormatter(logging.Formatter):
 
         return json.dumps(log_record)
 
+class ExtraInfoAdapter(logging.LoggerAdapter):
+    """
+    Lets callers write `logger.info(msg, extra_info={...})`; the dict ends up
+    on the record as `record.extra_info` for JsonFormatter.
+    """
+    def process(self, msg, kwargs):
+        extra_info = kwargs.pop("extra_info", None)
+        if extra_info is not None:
+            kwargs["extra"] = {**kwargs.get("extra", {}), "extra_info": extra_info}
+        return msg, kwargs
+
 def setup_logger(name="kurudu"):
     """
     Initializes a logger with the JsonFormatter.
@@ -55,7 +71,7 @@ def setup_logger(name="kurudu"):
         # Prevent propagation to the root logger to avoid duplicate logs in some environments
         logger.propagate = False
 
-    return logger
+    return ExtraInfoAdapter(logger, {})
 
 # Global logger instance
 logger = setup_logger()
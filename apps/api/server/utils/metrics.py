@@ -0,0 +1,80 @@
+import os
+import threading
+from prometheus_client import CollectorRegistry, Counter, generate_latest, multiprocess
+
+# ------------------------------------------------------
+# Counters are prometheus_client Counters created on first use. Under gunicorn,
+# PROMETHEUS_MULTIPROC_DIR is set (see gunicorn.conf.py) and every worker writes its
+# counts to files there, so a scrape answered by any worker reports the sum over all
+# of them. Without it (dev server, scripts) the counters are this process's own.
+
+
+class Metrics:
+    """
+    Counters keyed by metric name and labels.
+    Cheap enough to call on hot paths (no I/O beyond an mmap write, one lock).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def incr(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels)))
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counter(key)
+        (counter.labels(**labels) if labels else counter).inc(value)
+
+    def _counter(self, key):
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                name, labelnames = key
+                # Not registered anywhere: the same name may be used with different label
+                # sets, which a registry rejects, so _collect merges them by name instead
+                counter = Counter(f"kurudu_{name}", name.replace("_", " "), labelnames=labelnames, registry=None)
+                self._counters[key] = counter
+        return counter
+
+    def _collect(self):
+        with self._lock:
+            counters = list(self._counters.values())
+        families = {}
+        for counter in counters:
+            for family in counter.collect():
+                merged = families.setdefault(family.name, family)
+                if merged is not family:
+                    merged.samples.extend(family.samples)
+        return list(families.values())
+
+    def snapshot(self):
+        """Return a list of {name, labels, value} dicts for this process's counters."""
+        return [
+            {"name": family.name.removeprefix("kurudu_"), "labels": sample.labels, "value": sample.value}
+            for family in self._collect()
+            for sample in family.samples
+            if sample.name.endswith("_total")
+        ]
+
+    def render_prometheus(self):
+        """Counters in the Prometheus text exposition format, summed over workers when multiprocess."""
+        registry = CollectorRegistry()
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry.register(self)
+        return generate_latest(registry).decode()
+
+    def collect(self):
+        # Collector protocol, for render_prometheus without multiprocess mode
+        return self._collect()
+
+    def reset(self):
+        """Drop this process's counters (tests; counts already written in multiprocess mode stay)."""
+        with self._lock:
+            self._counters.clear()
+
+
+# Global metrics registry
+metrics = Metrics()
@@ -0,0 +1,182 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import jsonify
+from flask_jwt_extended import get_jwt_identity
+from server.utils.logger import logger
+from server.utils.metrics import metrics
+
+# ------------------------------------------------------
+
+
+class MemoryBackend:
+    """
+    Token buckets held in this process.
+    Buckets are kept in LRU order and the least recently used ones are dropped
+    once `max_keys` is reached, so a flood of distinct customers can't grow it unbounded.
+    """
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> [tokens, updated_at]
+        self._lock = threading.Lock()
+
+    def consume(self, key, rate, burst, cost=1):
+        """Take `cost` tokens from the bucket. Returns (allowed, retry_after_seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(burst), now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return True, 0.0
+            return False, (cost - bucket[0]) / rate
+
+
+class RedisBackend:
+    """
+    Token buckets shared across worker processes through Redis.
+    The refill and take happen in one Lua script so concurrent workers can't race,
+    and Redis' own clock is used so worker clock skew doesn't matter.
+    """
+
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or burst
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url, prefix="kurudu:rl:"):
+        import redis  # Optional dependency, only needed for the shared backend
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url, socket_timeout=0.05)
+        self._script = self.client.register_script(self.SCRIPT)
+
+    def consume(self, key, rate, burst, cost=1):
+        allowed, tokens = self._script(keys=[self.prefix + key], args=[rate, burst, cost])
+        if int(allowed):
+            return True, 0.0
+        return False, (cost - float(tokens)) / rate
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiting per authenticated customer and per outbound gateway account:
+    each merchant's own account for a gateway has its own bucket, and requests without a
+    merchant share the deployment account's bucket.
+
+    Usage:
+        @txn_bp.route("/initiate", methods=["POST"])
+        @jwt_required()
+        @limiter.limit_customer
+        def initiate_payment(): ...
+
+        rejected = limiter.check_gateway("paystack", merchant_id)
+        if rejected:
+            return rejected
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.backend = MemoryBackend()
+        self.customer_limit = (5.0, 20)
+        self.gateway_limit = (50.0, 100)
+        self.gateway_overrides = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get("RATE_LIMIT_ENABLED", True)
+        self.customer_limit = (
+            app.config.get("RATE_LIMIT_CUSTOMER_RATE", 5.0),
+            app.config.get("RATE_LIMIT_CUSTOMER_BURST", 20),
+        )
+        self.gateway_limit = (
+            app.config.get("RATE_LIMIT_GATEWAY_RATE", 50.0),
+            app.config.get("RATE_LIMIT_GATEWAY_BURST", 100),
+        )
+        self.gateway_overrides = app.config.get("RATE_LIMIT_GATEWAY_OVERRIDES", {})
+
+        if app.config.get("RATE_LIMIT_BACKEND", "memory") == "redis":
+            self.backend = RedisBackend(app.config["REDIS_URL"])
+        else:
+            self.backend = MemoryBackend()
+
+        app.extensions["rate_limiter"] = self
+
+    def consume(self, scope, ident, rate, burst, labels=None):
+        """
+        Returns (allowed, retry_after). Fails open if the shared backend is unreachable.
+        `labels` are added to the metrics; keep them to bounded values (never ids).
+        """
+        if not self.enabled:
+            return True, 0.0
+        try:
+            allowed, retry_after = self.backend.consume(f"{scope}:{ident}", rate, burst)
+        except Exception as exc:
+            logger.error("Rate limit backend unavailable", extra_info={"scope": scope, "error": str(exc)})
+            metrics.incr("rate_limit_backend_errors", scope=scope)
+            return True, 0.0
+
+        metrics.incr("rate_limit_allowed" if allowed else "rate_limit_rejected", scope=scope, **(labels or {}))
+        return allowed, retry_after
+
+    def limit_customer(self, fn):
+        """Decorator limiting a route per `get_jwt_identity()`. Place it below `@jwt_required()`."""
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            rate, burst = self.customer_limit
+            allowed, retry_after = self.consume("customer", get_jwt_identity(), rate, burst)
+            if not allowed:
+                return self._rejected("Too many requests", retry_after)
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    def acquire_gateway(self, gateway, merchant_id=None):
+        """Take a token for a call on the merchant's (or the deployment's) gateway account. Returns (allowed, retry_after)."""
+        rate, burst = self.gateway_overrides.get(gateway, self.gateway_limit)
+        ident = gateway if merchant_id is None else f"{gateway}:{merchant_id}"
+        # Merchant ids are unbounded, so only the gateway name is used as a label
+        return self.consume("gateway", ident, rate, burst, labels={"gateway": gateway})
+
+    def check_gateway(self, gateway, merchant_id=None):
+        """Take a token for an outbound gateway call. Returns a 429 response if the quota is spent, else None."""
+        allowed, retry_after = self.acquire_gateway(gateway, merchant_id)
+        if not allowed:
+            logger.warning("Gateway rate limit reached", extra_info={"gateway": gateway, "merchant_id": merchant_id})
+            return self._rejected(f"Gateway {gateway} is busy, retry later", retry_after)
+        return None
+
+    @staticmethod
+    def _rejected(message, retry_after):
+        resp = jsonify({"error": message, "status": 429})
+        resp.status_code = 429
+        resp.headers["Retry-After"] = str(max(1, int(retry_after + 0.999)))
+        return resp
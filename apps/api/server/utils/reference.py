@@ -0,0 +1,104 @@
+import hashlib
+import os
+import secrets
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+
+# ------------------------------------------------------
+# Time-ordered transaction references (ULID-style, 128 bits):
+#
+#   48 bits  unix time in milliseconds
+#   16 bits  node id (hash of NODE_ID or the hostname, and the pid)
+#   16 bits  sequence within the millisecond (monotonic per process)
+#   48 bits  randomness
+#
+# Encoded as 26 Crockford base32 characters, so references sort by creation
+# time both as strings and in the gateway_ref index, and inserts land at the
+# right-hand edge of the B-tree instead of on random pages.
+
+PREFIX = "txn_"
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ENCODED_LENGTH = 26
+_DECODE = {c: i for i, c in enumerate(ALPHABET)}
+
+
+def _encode(value):
+    chars = []
+    for _ in range(ENCODED_LENGTH):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def _decode(text):
+    value = 0
+    for c in text:
+        value = (value << 5) | _DECODE[c]
+    return value
+
+
+def _default_node_id():
+    # The pid is always mixed in: gunicorn workers forked from one master share NODE_ID
+    node = os.getenv("NODE_ID") or socket.gethostname()
+    digest = hashlib.blake2b(f"{node}:{os.getpid()}".encode(), digest_size=2).digest()
+    return int.from_bytes(digest, "big")
+
+
+class ReferenceGenerator:
+    """Thread-safe, monotonic reference generator for one process."""
+
+    def __init__(self, node_id=None):
+        self._fixed_node_id = node_id
+        self.reset()
+
+    def reset(self):
+        """Re-derive the node id and clear state (called in forked children)."""
+        self._lock = threading.Lock()
+        self.node_id = self._fixed_node_id if self._fixed_node_id is not None else _default_node_id()
+        self._last_ms = 0
+        self._sequence = 0
+
+    def generate(self):
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = 0
+            else:
+                # Same millisecond, or the clock stepped back: stay monotonic
+                self._sequence += 1
+                if self._sequence > 0xFFFF:
+                    self._last_ms += 1
+                    self._sequence = 0
+            ms, sequence = self._last_ms, self._sequence
+
+        value = (ms << 80) | (self.node_id << 64) | (sequence << 48) | secrets.randbits(48)
+        return PREFIX + _encode(value)
+
+
+def reference_timestamp(reference):
+    """Creation time encoded in a reference, as an aware UTC datetime."""
+    value = _decode(reference[len(PREFIX):])
+    return datetime.fromtimestamp((value >> 80) / 1000, tz=timezone.utc)
+
+
+def reference_bounds(start, end):
+    """
+    Lowest and highest possible references for the [start, end] datetime range,
+    so `gateway_ref BETWEEN low AND high` is an index range scan by time.
+    """
+    low = int(start.timestamp() * 1000) << 80
+    high = ((int(end.timestamp() * 1000) + 1) << 80) - 1
+    return PREFIX + _encode(low), PREFIX + _encode(high)
+
+
+_generator = ReferenceGenerator()
+if hasattr(os, "register_at_fork"):
+    # Forked workers (gunicorn preload) must not share the parent's node id and sequence
+    os.register_at_fork(after_in_child=_generator.reset)
+
+
+def generate_reference():
+    return _generator.generate()
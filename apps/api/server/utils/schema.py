@@ -0,0 +1,41 @@
+import sqlalchemy as sa
+from server.extensions import db
+
+# ------------------------------------------------------
+# Schema upgrades without a migration framework. `create_all()` creates missing
+# tables but never alters existing ones, so columns added to a model later (e.g.
+# transaction.merchant_id) are added here with ALTER TABLE.
+
+
+def upgrade_schema():
+    """
+    Create missing tables, then add model columns missing from existing tables.
+    Returns the added columns as "table.column". Only nullable columns can be
+    added this way; a new NOT NULL column needs a hand-written migration.
+    """
+    db.create_all()
+
+    engine = db.engine
+    inspector = sa.inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    added = []
+
+    with engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            missing = [column for column in table.columns if column.name not in existing]
+            for column in missing:
+                if not column.nullable:
+                    raise RuntimeError(f"Cannot add NOT NULL column {table.name}.{column.name} automatically")
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    sa.text(f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}")
+                )
+                added.append(f"{table.name}.{column.name}")
+
+            missing_names = {column.name for column in missing}
+            for index in table.indexes:
+                if missing_names & {column.name for column in index.columns}:
+                    index.create(conn, checkfirst=True)
+
+    return added
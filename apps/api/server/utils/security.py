@@ -1,3 +1,6 @@
+from functools import lru_cache
+from cryptography.fernet import Fernet, MultiFernet
+from flask import current_app
 from passlib.hash import bcrypt
 
 # ------------------------------------
@@ -9,3 +12,17 @@ def hash_password(password):
 
 def verify_password(password, hash):
     return bcrypt.verify(password, hash)
+
+
+@lru_cache(maxsize=4)
+def _fernet(keys):
+    # First key encrypts; all keys decrypt, so keys can be rotated
+    return MultiFernet([Fernet(key.strip()) for key in keys.split(",")])
+
+
+def encrypt_secret(secret):
+    return _fernet(current_app.config["GATEWAY_CREDENTIALS_KEY"]).encrypt(secret.encode()).decode()
+
+
+def decrypt_secret(token):
+    return _fernet(current_app.config["GATEWAY_CREDENTIALS_KEY"]).decrypt(token.encode()).decode()
@@ -1,5 +1,6 @@
 from datetime import datetime, date
 from sqlalchemy.inspection import inspect
+from server.utils.tracing import span
 
 # -------------------------------------------------
 
@@ -9,7 +10,9 @@ def to_dict(obj, seen=None):
     Prevents infinite recursion with cyclic references.
     """
     if seen is None:
-        seen = set()
+        # Outermost call: trace the whole serialization as one span, not each recursion
+        with span("to_dict", layer="serialize"):
+            return to_dict(obj, set())
 
     # Prevent cyclic references
     if id(obj) in seen:
@@ -0,0 +1,205 @@
+import random
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# ------------------------------------------------------
+# Request tracing. Spans are only recorded while a sampled request is active;
+# everywhere else `span()` and `@traced` cost a single ContextVar lookup.
+
+_current_trace = ContextVar("kurudu_trace", default=None)
+_NOOP = nullcontext()
+
+
+class Span:
+    __slots__ = ("name", "layer", "attrs", "start", "duration", "children")
+
+    def __init__(self, name, layer, attrs=None):
+        self.name = name
+        self.layer = layer
+        self.attrs = attrs
+        self.start = 0.0
+        self.duration = 0.0
+        self.children = []
+
+    def to_dict(self):
+        data = {"name": self.name, "layer": self.layer, "ms": round(self.duration * 1000, 3)}
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+
+class Trace:
+    """Span tree for one request."""
+
+    __slots__ = ("root", "stack")
+
+    def __init__(self, name):
+        self.root = Span(name, "request")
+        self.root.start = time.perf_counter()
+        self.stack = [self.root]
+
+    def layer_totals(self):
+        """Milliseconds per layer. Spans nested inside a span of the same layer aren't counted twice."""
+        totals = {}
+
+        def walk(span, open_layers):
+            counted = span.layer not in open_layers
+            if counted:
+                totals[span.layer] = totals.get(span.layer, 0.0) + span.duration * 1000
+                open_layers = open_layers | {span.layer}
+            for child in span.children:
+                walk(child, open_layers)
+
+        for child in self.root.children:
+            walk(child, frozenset())
+        return totals
+
+
+class _SpanContext:
+    __slots__ = ("trace", "span")
+
+    def __init__(self, trace, span):
+        self.trace = trace
+        self.span = span
+
+    def __enter__(self):
+        self.trace.stack[-1].children.append(self.span)
+        self.trace.stack.append(self.span)
+        self.span.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, *exc):
+        self.span.duration = time.perf_counter() - self.span.start
+        self.trace.stack.pop()
+        return False
+
+
+def span(name, layer=None, **attrs):
+    """Context manager recording a span under the current trace, or a no-op when not sampling."""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP
+    return _SpanContext(trace, Span(name, layer or name, attrs or None))
+
+
+def traced(layer, name=None):
+    """Decorator recording each call of the function as a span in `layer`."""
+
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return fn(*args, **kwargs)
+            with _SpanContext(trace, Span(span_name, layer)):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# SQLAlchemy hooks: one "db" span per statement executed during a sampled request
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    ctx = _SpanContext(trace, Span("sql", "db", {"statement": statement[:200]}))
+    ctx.__enter__()
+    conn.info.setdefault("kurudu_spans", []).append(ctx)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("kurudu_spans")
+    if spans:
+        spans.pop().__exit__(None, None, None)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    spans = conn.info.get("kurudu_spans") if conn is not None else None
+    if spans:
+        spans.pop().__exit__(None, None, None)
+
+
+class Tracer:
+    """
+    Sampled per-request tracing with a `Server-Timing` response header and
+    span-tree dumps for slow requests.
+
+    TRACING_SAMPLE_RATE: fraction of requests to record spans for (0 disables span recording).
+    TRACING_SLOW_REQUEST_MS: requests slower than this are logged (with the full
+        span tree when sampled). 0 disables.
+    With both at 0 no hooks are registered at all.
+    """
+
+    def __init__(self, app=None):
+        self.sample_rate = 0.0
+        self.slow_request_ms = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.sample_rate = app.config.get("TRACING_SAMPLE_RATE", 0.0)
+        self.slow_request_ms = app.config.get("TRACING_SLOW_REQUEST_MS", 0)
+        app.extensions["tracer"] = self
+
+        if not self.sample_rate and not self.slow_request_ms:
+            return
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.teardown_request(self._teardown_request)
+
+        if self.sample_rate and not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(Engine, "handle_error", _handle_error)
+
+    def _start_request(self):
+        g.trace_start = time.perf_counter()
+        if self.sample_rate and random.random() < self.sample_rate:
+            _current_trace.set(Trace(f"{request.method} {request.path}"))
+
+    def _finish_request(self, response):
+        start = g.get("trace_start")
+        if start is None:
+            return response
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        trace = _current_trace.get()
+        # Stop recording before logging below so the dump doesn't trace itself
+        _current_trace.set(None)
+
+        timings = [f"total;dur={elapsed_ms:.2f}"]
+        if trace is not None:
+            trace.root.duration = elapsed_ms / 1000
+            timings.extend(f"{layer};dur={ms:.2f}" for layer, ms in trace.layer_totals().items())
+        response.headers["Server-Timing"] = ", ".join(timings)
+
+        if self.slow_request_ms and elapsed_ms >= self.slow_request_ms:
+            # Imported here: the logger itself is traced, so it imports this module
+            from server.utils.logger import logger
+
+            extra_info = {"path": request.path, "status": response.status_code, "ms": round(elapsed_ms, 2)}
+            if trace is not None:
+                extra_info["trace"] = trace.root.to_dict()
+            logger.warning("Slow request", extra_info=extra_info)
+
+        return response
+
+    @staticmethod
+    def _teardown_request(exc):
+        # after_request is skipped on unhandled errors; never leak a trace into the next request on this thread
+        _current_trace.set(None)
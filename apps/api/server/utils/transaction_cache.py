@@ -0,0 +1,119 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from server.utils.metrics import metrics
+
+# ------------------------------------------------------
+
+
+class CachedTransaction:
+    """
+    Compact, read-only view of a Transaction for hot lookups (status polling, OTP).
+    Holds only what those routes need, so an entry is a few hundred bytes instead
+    of a full ORM instance with its session state.
+    """
+
+    __slots__ = ("gateway_ref", "customer_id", "merchant_id", "gateway", "status", "amount", "expires_at")
+
+    def __init__(self, gateway_ref, customer_id, merchant_id, gateway, status, amount, expires_at):
+        self.gateway_ref = gateway_ref
+        self.customer_id = customer_id
+        self.merchant_id = merchant_id
+        # Few distinct values; interning shares one string object across entries
+        self.gateway = sys.intern(gateway)
+        self.status = sys.intern(status)
+        self.amount = amount
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_model(cls, txn, expires_at):
+        return cls(txn.gateway_ref, txn.customer_id, txn.merchant_id, txn.gateway, txn.status, txn.amount, expires_at)
+
+    def size_bytes(self):
+        return sys.getsizeof(self) + sys.getsizeof(self.gateway_ref)
+
+
+class TransactionCache:
+    """
+    Bounded in-process LRU of recently created transactions with a TTL.
+
+    Filled on create and updated on every status change made by this process.
+    Other processes' status changes only show up after the TTL, so `status` is
+    only good for skipping writes that wouldn't change it (verify/OTP polling);
+    `gateway`, `customer_id` and `merchant_id` never change.
+    Set HOT_TXN_CACHE_SIZE = 0 to disable.
+    """
+
+    def __init__(self, app=None):
+        self.max_size = 50_000
+        self.ttl = 600.0
+        self._entries = OrderedDict()  # gateway_ref -> CachedTransaction
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_size = app.config.get("HOT_TXN_CACHE_SIZE", 50_000)
+        self.ttl = app.config.get("HOT_TXN_CACHE_TTL", 600.0)
+        app.extensions["transaction_cache"] = self
+
+    def get(self, gateway_ref):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(gateway_ref)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[gateway_ref]
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(gateway_ref)
+                self.hits += 1
+        metrics.incr("transaction_cache", result="miss" if entry is None else "hit")
+        return entry
+
+    def put(self, txn):
+        """Cache a Transaction model instance as a compact record."""
+        if not self.max_size:
+            return None
+        entry = CachedTransaction.from_model(txn, time.monotonic() + self.ttl)
+        with self._lock:
+            self._entries[entry.gateway_ref] = entry
+            self._entries.move_to_end(entry.gateway_ref)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def set_status(self, gateway_ref, status):
+        with self._lock:
+            entry = self._entries.get(gateway_ref)
+            if entry is not None:
+                entry.status = sys.intern(status)
+
+    def discard(self, gateway_ref):
+        with self._lock:
+            self._entries.pop(gateway_ref, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters plus an estimate of the memory held by entries and the index."""
+        with self._lock:
+            entries = list(self._entries.values())
+            index_bytes = sys.getsizeof(self._entries)
+        entry_bytes = sum(entry.size_bytes() for entry in entries)
+        return {
+            "size": len(entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "memory_bytes": entry_bytes + index_bytes,
+            "bytes_per_entry": (entry_bytes + index_bytes) / len(entries) if entries else 0,
+        }
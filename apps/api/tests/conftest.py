@@ -0,0 +1,32 @@
+import os
+import tempfile
+import pytest
+
+# Config is read from the environment when `server` is first imported
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.sqlite3')}",
+    JWT_SECRET_KEY="test-secret-key-0123456789abcdef",
+)
+for name in ("DATABASE_REPLICA_URLS", "METRICS_TOKEN", "PROMETHEUS_MULTIPROC_DIR", "RATE_LIMIT_BACKEND"):
+    os.environ.pop(name, None)
+
+from server import create_app  # noqa: E402
+from server.extensions import db  # noqa: E402
+
+# ------------------------------------------------------
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
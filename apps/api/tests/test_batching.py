@@ -0,0 +1,84 @@
+import threading
+import pytest
+from server.utils.batching import MicroBatcher
+
+# ------------------------------------------------------
+
+
+def submit_concurrently(batcher, keys):
+    """Submit every key from its own thread; returns key -> result or exception."""
+    results = {}
+    start = threading.Barrier(len(keys))
+
+    def submit(i, key):
+        start.wait()
+        try:
+            results[i] = batcher.submit(key)
+        except Exception as exc:
+            results[i] = exc
+
+    threads = [threading.Thread(target=submit, args=(i, key)) for i, key in enumerate(keys)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [results[i] for i in range(len(keys))]
+
+
+def test_concurrent_submits_share_one_call():
+    calls = []
+
+    def fn(keys):
+        calls.append(sorted(keys))
+        return {key: key.upper() for key in keys}
+
+    batcher = MicroBatcher(fn, max_batch=10, max_wait=0.5)
+    assert submit_concurrently(batcher, ["a", "b", "c"]) == ["A", "B", "C"]
+    assert calls == [["a", "b", "c"]]
+
+
+def test_identical_keys_are_deduplicated():
+    calls = []
+
+    def fn(keys):
+        calls.append(sorted(keys))
+        return {key: key for key in keys}
+
+    batcher = MicroBatcher(fn, max_batch=10, max_wait=0.5)
+    assert submit_concurrently(batcher, ["a", "a", "b"]) == ["a", "a", "b"]
+    assert calls == [["a", "b"]]
+
+
+def test_full_batch_is_sent_without_waiting():
+    batcher = MicroBatcher(lambda keys: {key: key for key in keys}, max_batch=2, max_wait=30)
+    assert submit_concurrently(batcher, ["a", "b"]) == ["a", "b"]
+
+
+def test_exception_values_fail_only_their_key():
+    error = ValueError("gateway said no")
+    batcher = MicroBatcher(lambda keys: {key: error if key == "bad" else key for key in keys}, max_wait=0.5)
+
+    good, bad = submit_concurrently(batcher, ["good", "bad"])
+    assert good == "good"
+    assert bad is error
+
+
+def test_keys_missing_from_the_result_raise_key_error():
+    batcher = MicroBatcher(lambda keys: {}, max_wait=0)
+    with pytest.raises(KeyError):
+        batcher.submit("a")
+
+
+def test_bulk_call_failure_fails_every_caller():
+    def fn(keys):
+        raise ConnectionError("down")
+
+    batcher = MicroBatcher(fn, max_wait=0.5)
+    results = submit_concurrently(batcher, ["a", "b"])
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_batcher_is_reusable_after_a_batch():
+    batcher = MicroBatcher(lambda keys: {key: key for key in keys}, max_wait=0)
+    assert batcher.submit("a") == "a"
+    assert batcher.submit("b") == "b"
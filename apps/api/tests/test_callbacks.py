@@ -0,0 +1,111 @@
+import hashlib
+import hmac
+import socket
+import pytest
+from server.services import outbox_service
+from server.utils import callbacks
+from server.utils.callbacks import pin_callback_url, sign_callback, validate_callback_url
+
+# ------------------------------------------------------
+
+PUBLIC = "93.184.215.14"
+
+
+class Resolver:
+    """getaddrinfo stub answering with each of `answers` in turn, then the last one."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = 0
+
+    def __call__(self, host, port, *args, **kwargs):
+        answer = self.answers[min(self.calls, len(self.answers) - 1)]
+        self.calls += 1
+        family = socket.AF_INET6 if ":" in answer else socket.AF_INET
+        return [(family, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (answer, port))]
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    def install(*answers):
+        resolver = Resolver(*answers)
+        monkeypatch.setattr(callbacks.socket, "getaddrinfo", resolver)
+        return resolver
+
+    return install
+
+
+@pytest.mark.parametrize("address", ["127.0.0.1", "10.0.0.5", "169.254.169.254", "::1"])
+def test_internal_addresses_are_refused(resolver, address):
+    resolver(address)
+    with pytest.raises(ValueError, match="public address"):
+        validate_callback_url("https://hooks.example.com/kurudu")
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["http://hooks.example.com/", "ftp://hooks.example.com/", "https://user:pw@hooks.example.com/", "https:///path"],
+)
+def test_malformed_urls_are_refused(resolver, url):
+    resolver(PUBLIC)
+    with pytest.raises(ValueError):
+        validate_callback_url(url)
+
+
+def test_public_host_returns_the_checked_address(resolver):
+    resolver(PUBLIC)
+    assert validate_callback_url("https://hooks.example.com/kurudu") == PUBLIC
+
+
+def test_allowlist_restricts_hosts_but_allows_private_addresses(resolver):
+    resolver("10.0.0.5")
+    assert validate_callback_url("https://hooks.internal/", allowed_hosts={"hooks.internal"}) == "10.0.0.5"
+    with pytest.raises(ValueError, match="not allowed"):
+        validate_callback_url("https://other.internal/", allowed_hosts={"hooks.internal"})
+
+
+def test_pinned_url_keeps_host_for_headers_and_sni():
+    url, headers, extensions = pin_callback_url("https://hooks.example.com:8443/cb?x=1", "2001:db8::1")
+    assert url == "https://[2001:db8::1]:8443/cb?x=1"
+    assert headers == {"Host": "hooks.example.com:8443"}
+    assert extensions == {"sni_hostname": "hooks.example.com"}
+
+
+def test_signature_is_hmac_of_timestamp_and_body():
+    body = b'{"status":"success"}'
+    expected = hmac.new(b"secret", b"1700000000." + body, hashlib.sha256).hexdigest()
+    assert sign_callback(body, "secret", timestamp=1700000000) == f"t=1700000000,v1={expected}"
+
+
+def test_rebinding_host_cannot_redirect_the_callback(app, resolver, monkeypatch):
+    """The host resolves to a public address when checked, then to loopback for anyone asking again."""
+    app.config.update(CALLBACK_SIGNING_SECRET="secret", CALLBACK_ALLOWED_HOSTS=set())
+    lookups = resolver(PUBLIC, "127.0.0.1")
+    sent = []
+
+    class RecordingClient:
+        def __init__(self, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def post(self, url, content, headers, extensions):
+            sent.append((url, headers, extensions))
+
+    monkeypatch.setattr(outbox_service.httpx, "Client", RecordingClient)
+    message = outbox_service.OutboxMessage(
+        gateway_ref="txn_1", kind="initiate", status="done", callback_url="https://hooks.example.com/kurudu"
+    )
+
+    outbox_service._send_callback(message, "success")
+
+    ((url, headers, extensions),) = sent
+    assert url == f"https://{PUBLIC}/kurudu"
+    assert headers["Host"] == "hooks.example.com"
+    assert extensions == {"sni_hostname": "hooks.example.com"}
+    assert lookups.calls == 1  # the POST itself never resolved the host
+    assert socket.getaddrinfo("hooks.example.com", 443)[0][4][0] == "127.0.0.1"
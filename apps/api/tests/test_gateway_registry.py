@@ -0,0 +1,51 @@
+import pytest
+from cryptography.fernet import Fernet
+from server.services.gateway_registry import GatewayRegistry, set_gateway_credentials
+from server.services.payment_service import PaystackService
+
+# ------------------------------------------------------
+
+
+@pytest.fixture
+def registry(app):
+    app.config.update(GATEWAY_CREDENTIALS_KEY=Fernet.generate_key().decode(), GATEWAY_CREDENTIALS_RECHECK_SECONDS=0)
+    registry = GatewayRegistry()
+    yield registry
+    registry.close()
+
+
+def test_merchant_adapters_are_cached(registry):
+    set_gateway_credentials(1, "paystack", "sk_one")
+    adapter = registry.get("paystack", 1)
+
+    assert isinstance(adapter, PaystackService)
+    assert adapter.secret_key == "sk_one"
+    assert registry.get("paystack", 1) is adapter
+
+
+def test_rotation_from_another_process_rebuilds_the_adapter(app, registry):
+    set_gateway_credentials(1, "paystack", "sk_old")
+    old = registry.get("paystack", 1)
+
+    # set_gateway_credentials only invalidates its own process's global registry
+    set_gateway_credentials(1, "paystack", "sk_new")
+    new = registry.get("paystack", 1)
+
+    assert new is not old
+    assert new.secret_key == "sk_new"
+    assert [adapter for _, adapter in registry._retired] == [old]
+
+
+def test_unchanged_credentials_are_not_rebuilt_between_rechecks(app, registry):
+    app.config["GATEWAY_CREDENTIALS_RECHECK_SECONDS"] = 3600
+    set_gateway_credentials(1, "paystack", "sk_old")
+    old = registry.get("paystack", 1)
+    set_gateway_credentials(1, "paystack", "sk_new")
+
+    # Within the recheck interval the cached adapter is served without a query
+    assert registry.get("paystack", 1) is old
+
+
+def test_unknown_merchant_or_gateway_has_no_adapter(registry):
+    assert registry.get("paystack", 404) is None
+    assert registry.get("stripe", 1) is None
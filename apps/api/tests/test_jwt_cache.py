@@ -0,0 +1,79 @@
+import pytest
+from flask_jwt_extended import create_access_token, decode_token
+from server.extensions import jwt
+from server.utils import jwt_cache
+from server.utils.jwt_cache import TokenCache
+
+# ------------------------------------------------------
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = {"now": 1_700_000_000.0}
+    monkeypatch.setattr(jwt_cache.time, "time", lambda: clock["now"])
+    return clock
+
+
+def test_entries_expire_with_the_token(now):
+    cache = TokenCache()
+    cache.set(b"k", {"sub": "1", "exp": now["now"] + 10})
+    assert cache.get(b"k") == {"sub": "1", "exp": now["now"] + 10}
+
+    now["now"] += 10
+    assert cache.get(b"k") is None
+    assert len(cache) == 0
+
+
+def test_tokens_without_exp_stay_cached(now):
+    cache = TokenCache()
+    cache.set(b"k", {"sub": "1"})
+    now["now"] += 10**6
+    assert cache.get(b"k") == {"sub": "1"}
+
+
+def test_least_recently_used_entries_are_evicted(now):
+    cache = TokenCache(max_size=2)
+    cache.set(b"a", {"sub": "a"})
+    cache.set(b"b", {"sub": "b"})
+    cache.get(b"a")
+    cache.set(b"c", {"sub": "c"})
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == {"sub": "a"}
+    assert cache.get(b"c") == {"sub": "c"}
+
+
+def test_sweep_drops_expired_entries_that_are_never_read(now):
+    cache = TokenCache(sweep_interval=60)
+    for i in range(5):
+        cache.set(str(i).encode(), {"sub": str(i), "exp": now["now"] + 30})
+
+    now["now"] += 61
+    cache.set(b"fresh", {"sub": "fresh", "exp": now["now"] + 30})
+    assert len(cache) == 1
+
+
+def test_keys_are_digests_not_tokens():
+    key = TokenCache.key("header.payload.signature")
+    assert isinstance(key, bytes) and len(key) == 32
+    assert b"payload" not in key
+
+
+def test_manager_serves_repeat_decodes_from_the_cache(app):
+    token = create_access_token(identity="1")
+    first = decode_token(token)
+    assert len(jwt.token_cache) == 1
+
+    second = decode_token(token)
+    assert second == first
+    # Callers get a copy, so mutating claims can't poison the cache
+    second["sub"] = "2"
+    assert decode_token(token)["sub"] == "1"
+
+
+def test_manager_rejects_tampered_tokens_even_after_caching(app):
+    token = create_access_token(identity="1")
+    decode_token(token)
+
+    with pytest.raises(Exception):
+        decode_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
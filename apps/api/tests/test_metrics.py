@@ -0,0 +1,32 @@
+from server import create_app
+from server.utils.metrics import metrics
+
+# ------------------------------------------------------
+
+
+def test_metrics_endpoint_is_off_without_a_token(client):
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_endpoint_requires_the_token(monkeypatch):
+    monkeypatch.setattr("server.config.Config.METRICS_TOKEN", "scrape-token")
+    client = create_app().test_client()
+    metrics.incr("gateway_adapter_cache", result="hit")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    resp = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert resp.status_code == 200
+    assert 'kurudu_gateway_adapter_cache_total{result="hit"}' in resp.get_data(as_text=True)
+
+
+def test_counters_with_different_label_sets_share_one_family():
+    metrics.reset()
+    metrics.incr("rate_limit_allowed", scope="customer")
+    metrics.incr("rate_limit_allowed", scope="gateway", gateway="paystack")
+
+    text = metrics.render_prometheus()
+    assert text.count("# TYPE kurudu_rate_limit_allowed_total counter") == 1
+    assert 'kurudu_rate_limit_allowed_total{scope="customer"} 1.0' in text
+    assert 'kurudu_rate_limit_allowed_total{gateway="paystack",scope="gateway"} 1.0' in text
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+import pytest
+from server.extensions import db
+from server.models.outbox_model import OutboxMessage
+from server.models.transaction_model import Transaction
+from server.models.user_model import User
+from server.services import outbox_service
+from server.services.outbox_service import claim_batch, dispatch_message, enqueue_initiate
+
+# ------------------------------------------------------
+
+
+@pytest.fixture
+def queued(app):
+    """Factory for committed pending transactions with an initiate message."""
+    user = User(email="o@test.io", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+
+    def queue(ref, **fields):
+        db.session.add(Transaction(gateway_ref=ref, amount=100, gateway="paystack", status="pending", customer_id=user.id))
+        message = enqueue_initiate(ref, "o@test.io", 100)
+        for name, value in fields.items():
+            setattr(message, name, value)
+        db.session.commit()
+        return message
+
+    return queue
+
+
+class FakeAdapter:
+    def __init__(self, *results):
+        self.results = list(results)
+
+    def initialize_charge(self, **kwargs):
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    adapter = FakeAdapter()
+    monkeypatch.setattr(outbox_service.gateways, "get", lambda gateway, merchant_id=None: adapter)
+    return adapter
+
+
+def test_claim_takes_due_messages_in_order_up_to_the_batch_size(queued):
+    first, second, third = (queued(f"txn_{i}").id for i in range(3))
+    queued("txn_later", available_at=datetime.now() + timedelta(minutes=5))
+
+    claimed = claim_batch(batch_size=2, lease_seconds=60)
+
+    assert [message.id for message in claimed] == [first, second]
+    assert all(message.status == "processing" and message.locked_until > datetime.now() for message in claimed)
+    assert [message.id for message in claim_batch(batch_size=10, lease_seconds=60)] == [third]
+    assert claim_batch(batch_size=10, lease_seconds=60) == []
+
+
+def test_expired_lease_is_claimed_again(queued):
+    live = queued("txn_live", status="processing", locked_until=datetime.now() + timedelta(minutes=1))
+    crashed = queued("txn_crashed", status="processing", locked_until=datetime.now() - timedelta(seconds=1))
+
+    claimed = claim_batch(batch_size=10, lease_seconds=60)
+
+    assert [message.id for message in claimed] == [crashed.id]
+    assert db.session.get(OutboxMessage, live.id).status == "processing"
+
+
+def test_finished_messages_are_never_claimed(queued):
+    queued("txn_done", status="done")
+    queued("txn_failed", status="failed")
+    assert claim_batch(batch_size=10, lease_seconds=60) == []
+
+
+def test_success_is_stored_with_the_transaction_status(queued, adapter):
+    queued("txn_ok")
+    adapter.results.append({"status": True, "data": {"status": "success"}})
+    (message,) = claim_batch(batch_size=1, lease_seconds=60)
+
+    dispatch_message(message, max_attempts=3)
+
+    assert (message.status, message.attempts, message.locked_until) == ("done", 1, None)
+    assert Transaction.query.filter_by(gateway_ref="txn_ok").one().status == "success"
+
+
+def test_gateway_errors_back_off_then_fail(queued, adapter):
+    queued("txn_flaky")
+    adapter.results.extend([ConnectionError("reset"), ConnectionError("reset again")])
+
+    (message,) = claim_batch(batch_size=1, lease_seconds=60)
+    dispatch_message(message, max_attempts=2)
+    assert (message.status, message.attempts, message.last_error) == ("pending", 1, "reset")
+    assert message.available_at > datetime.now() + timedelta(seconds=1)
+    assert claim_batch(batch_size=1, lease_seconds=60) == []
+
+    message.available_at = datetime.now()
+    db.session.commit()
+    (message,) = claim_batch(batch_size=1, lease_seconds=60)
+    dispatch_message(message, max_attempts=2)
+    assert (message.status, message.attempts, message.last_error) == ("failed", 2, "reset again")
+    assert Transaction.query.filter_by(gateway_ref="txn_flaky").one().status == "failed"
+
+
+def test_spent_gateway_quota_requeues_without_an_attempt(app, queued, adapter):
+    queued("txn_busy")
+    limiter = app.extensions["rate_limiter"]
+    limiter.gateway_limit = (0.5, 0)
+
+    (message,) = claim_batch(batch_size=1, lease_seconds=60)
+    dispatch_message(message, max_attempts=2)
+
+    assert (message.status, message.attempts) == ("pending", 0)
+    assert message.available_at > datetime.now()
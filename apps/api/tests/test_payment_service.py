@@ -0,0 +1,87 @@
+import threading
+import httpx
+import pytest
+from server.services.payment_service import PaystackService
+from server.utils.http_client import GatewayHTTPClient
+
+# ------------------------------------------------------
+
+
+def paystack(handler):
+    service = PaystackService()
+    service.base_url = "https://paystack.test"
+    service.http.close()
+    service.http = GatewayHTTPClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+def test_bulk_verify_keeps_the_newest_match_and_fetches_misses():
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path)
+        if request.url.path == "/transaction":
+            # Newest first: the retried attempt, then the abandoned one
+            return httpx.Response(
+                200,
+                json={
+                    "data": [
+                        {"reference": "ps_2", "status": "success", "metadata": {"internal_gateway_ref": "txn_a"}},
+                        {"reference": "ps_1", "status": "abandoned", "metadata": {"internal_gateway_ref": "txn_a"}},
+                    ]
+                },
+            )
+        if request.url.path.endswith("/txn_broken"):
+            return httpx.Response(502, text="bad gateway")
+        return httpx.Response(200, json={"data": {"reference": request.url.path.rsplit("/", 1)[-1], "status": "failed"}})
+
+    results = paystack(handler).verify_payments(["txn_a", "txn_b", "txn_broken"])
+
+    assert results["txn_a"]["data"]["reference"] == "ps_2"
+    assert results["txn_b"]["data"] == {"reference": "txn_b", "status": "failed"}
+    assert isinstance(results["txn_broken"], ValueError)
+    assert sorted(requested) == ["/transaction", "/transaction/verify/txn_b", "/transaction/verify/txn_broken"]
+
+
+def test_bulk_verify_returns_transport_errors_per_reference():
+    def handler(request):
+        if request.url.path == "/transaction":
+            return httpx.Response(200, json={"data": []})
+        if request.url.path.endswith("/txn_down"):
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(200, json={"data": {"status": "success"}})
+
+    results = paystack(handler).verify_payments(["txn_ok", "txn_down"])
+
+    assert results["txn_ok"]["data"]["status"] == "success"
+    assert isinstance(results["txn_down"], httpx.ConnectError)
+
+
+def test_client_is_shared_safely_between_threads():
+    def handler(request):
+        return httpx.Response(200, json={"reference": request.url.path.rsplit("/", 1)[-1]})
+
+    client = GatewayHTTPClient(transport=httpx.MockTransport(handler))
+    results = {}
+
+    def call(i):
+        results[i] = client.get(f"https://paystack.test/transaction/verify/r{i}").json()["reference"]
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.close()
+
+    assert results == {i: f"r{i}" for i in range(32)}
+    assert client.is_closed
+
+
+def test_client_raises_request_errors_in_the_calling_thread():
+    def handler(request):
+        raise httpx.ReadTimeout("slow gateway")
+
+    client = GatewayHTTPClient(transport=httpx.MockTransport(handler))
+    with pytest.raises(httpx.ReadTimeout):
+        client.get("https://paystack.test/transaction/verify/r1")
@@ -0,0 +1,107 @@
+import pytest
+from server.utils import rate_limit
+from server.utils.metrics import metrics
+from server.utils.rate_limit import MemoryBackend, RateLimiter
+
+# ------------------------------------------------------
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_allows_burst_then_rejects_with_retry_after(clock):
+    backend = MemoryBackend()
+    assert all(backend.consume("k", rate=2.0, burst=3)[0] for _ in range(3))
+
+    allowed, retry_after = backend.consume("k", rate=2.0, burst=3)
+    assert not allowed
+    assert retry_after == pytest.approx(0.5)
+
+
+def test_bucket_refills_at_rate_up_to_burst(clock):
+    backend = MemoryBackend()
+    for _ in range(3):
+        backend.consume("k", rate=2.0, burst=3)
+
+    clock.now += 0.5
+    assert backend.consume("k", rate=2.0, burst=3)[0]
+    assert not backend.consume("k", rate=2.0, burst=3)[0]
+
+    clock.now += 60
+    assert sum(backend.consume("k", rate=2.0, burst=3)[0] for _ in range(5)) == 3
+
+
+def test_least_recently_used_buckets_are_dropped(clock):
+    backend = MemoryBackend(max_keys=2)
+    backend.consume("a", rate=1.0, burst=1)
+    backend.consume("b", rate=1.0, burst=1)
+    backend.consume("a", rate=1.0, burst=1)  # "a" is now the most recent
+    backend.consume("c", rate=1.0, burst=1)
+
+    assert list(backend._buckets) == ["a", "c"]
+
+
+def test_gateway_buckets_are_per_merchant_account(clock):
+    limiter = RateLimiter()
+    limiter.gateway_limit = (1.0, 1)
+
+    assert limiter.acquire_gateway("paystack", merchant_id=1)[0]
+    assert not limiter.acquire_gateway("paystack", merchant_id=1)[0]
+    assert limiter.acquire_gateway("paystack", merchant_id=2)[0]
+    assert limiter.acquire_gateway("paystack")[0]
+    assert limiter.acquire_gateway("moniepoint", merchant_id=1)[0]
+
+
+def test_gateway_overrides_replace_the_default_limit(clock):
+    limiter = RateLimiter()
+    limiter.gateway_limit = (1.0, 1)
+    limiter.gateway_overrides = {"paystack": (1.0, 3)}
+
+    assert sum(limiter.acquire_gateway("paystack")[0] for _ in range(5)) == 3
+    assert sum(limiter.acquire_gateway("moniepoint")[0] for _ in range(5)) == 1
+
+
+def test_backend_errors_fail_open():
+    class BrokenBackend:
+        def consume(self, key, rate, burst, cost=1):
+            raise ConnectionError("redis down")
+
+    limiter = RateLimiter()
+    limiter.backend = BrokenBackend()
+    metrics.reset()
+
+    assert limiter.consume("customer", "1", 1.0, 1) == (True, 0.0)
+    assert {"name": "rate_limit_backend_errors", "labels": {"scope": "customer"}, "value": 1.0} in metrics.snapshot()
+
+
+def test_disabled_limiter_always_allows():
+    limiter = RateLimiter()
+    limiter.enabled = False
+    limiter.customer_limit = (1.0, 1)
+
+    assert all(limiter.consume("customer", "1", 1.0, 1)[0] for _ in range(10))
+
+
+def test_gateway_rejection_is_a_429_with_retry_after(app, clock):
+    limiter = RateLimiter()
+    limiter.gateway_limit = (0.5, 1)
+
+    with app.test_request_context():
+        assert limiter.check_gateway("paystack", 7) is None
+        rejected = limiter.check_gateway("paystack", 7)
+
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"] == "2"
+    assert rejected.get_json()["status"] == 429
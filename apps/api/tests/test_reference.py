@@ -0,0 +1,119 @@
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+import pytest
+from server.utils import reference
+from server.utils.reference import ReferenceGenerator, reference_bounds, reference_timestamp
+
+# ------------------------------------------------------
+
+T0 = 1_760_000_000_000  # ms
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = {"ms": T0}
+    monkeypatch.setattr(reference.time, "time_ns", lambda: clock["ms"] * 1_000_000)
+    return clock
+
+
+def fields(ref):
+    value = reference._decode(ref[len(reference.PREFIX):])
+    return value >> 80, (value >> 64) & 0xFFFF, (value >> 48) & 0xFFFF
+
+
+def test_references_are_monotonic_within_a_millisecond(clock):
+    generator = ReferenceGenerator(node_id=7)
+    refs = [generator.generate() for _ in range(100)]
+
+    assert refs == sorted(refs)
+    assert len(set(refs)) == 100
+    assert [fields(ref) for ref in refs[:3]] == [(T0, 7, 0), (T0, 7, 1), (T0, 7, 2)]
+
+
+def test_clock_stepping_back_keeps_references_increasing(clock):
+    generator = ReferenceGenerator(node_id=7)
+    first = generator.generate()
+    clock["ms"] -= 5000
+    second = generator.generate()
+
+    assert second > first
+    assert fields(second) == (T0, 7, 1)
+
+
+def test_sequence_overflow_borrows_the_next_millisecond(clock):
+    generator = ReferenceGenerator(node_id=7)
+    generator.generate()
+    generator._sequence = 0xFFFF
+    before = generator.generate()
+    after = generator.generate()
+
+    assert fields(before) == (T0 + 1, 7, 0)
+    assert fields(after) == (T0 + 1, 7, 1)
+    assert after > before
+
+
+def test_new_millisecond_resets_the_sequence(clock):
+    generator = ReferenceGenerator(node_id=7)
+    generator.generate()
+    generator.generate()
+    clock["ms"] += 1
+    assert fields(generator.generate()) == (T0 + 1, 7, 0)
+
+
+def test_node_id_mixes_in_the_pid_when_node_id_is_set(monkeypatch):
+    monkeypatch.setenv("NODE_ID", "3")
+    monkeypatch.setattr(reference.os, "getpid", lambda: 100)
+    first = reference._default_node_id()
+    monkeypatch.setattr(reference.os, "getpid", lambda: 101)
+    second = reference._default_node_id()
+
+    assert first != second
+    assert first == int.from_bytes(hashlib.blake2b(b"3:100", digest_size=2).digest(), "big")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_gets_a_fresh_node_id_and_sequence():
+    generator = reference._generator
+    generator.generate()
+    parent_node = generator.node_id
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        state = f"{generator.node_id},{generator._last_ms},{generator._sequence}"
+        os.write(write_end, state.encode())
+        os._exit(0)
+
+    os.close(write_end)
+    with os.fdopen(read_end) as pipe:
+        node_id, last_ms, sequence = (int(part) for part in pipe.read().split(","))
+    os.waitpid(pid, 0)
+
+    node = os.getenv("NODE_ID") or reference.socket.gethostname()
+    expected = int.from_bytes(hashlib.blake2b(f"{node}:{pid}".encode(), digest_size=2).digest(), "big")
+    assert node_id == expected
+    assert (last_ms, sequence) == (0, 0)
+    assert generator.node_id == parent_node
+
+
+def test_reference_bounds_cover_exactly_the_time_range(clock):
+    generator = ReferenceGenerator()
+    start = datetime.fromtimestamp(T0 / 1000, tz=timezone.utc)
+    end = start + timedelta(seconds=1)
+    low, high = reference_bounds(start, end)
+
+    inside = []
+    for ms in (T0, T0 + 500, T0 + 1000):
+        clock["ms"] = ms
+        inside.append(generator.generate())
+    clock["ms"] = T0 - 1
+    before = ReferenceGenerator().generate()
+    clock["ms"] = T0 + 1001
+    after = generator.generate()
+
+    assert all(low <= ref <= high for ref in inside)
+    assert before < low
+    assert after > high
+    assert reference_timestamp(inside[1]) == start + timedelta(milliseconds=500)
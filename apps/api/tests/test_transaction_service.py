@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from server.extensions import db
+from server.models.transaction_model import Transaction
+from server.models.user_model import User
+from server.services import transaction_service
+from server.services.transaction_service import create_transaction
+
+# ------------------------------------------------------
+
+
+@pytest.fixture
+def user(app):
+    user = User(email="t@test.io", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_reference_collision_is_retried_with_a_new_reference(user, monkeypatch):
+    existing = create_transaction(amount=100, gateway="paystack", customer_id=user.id)
+    refs = iter([existing.gateway_ref, "txn_fresh"])
+    monkeypatch.setattr(transaction_service, "generate_reference", lambda: next(refs))
+
+    txn = create_transaction(amount=200, gateway="paystack", customer_id=user.id)
+
+    assert txn.gateway_ref == "txn_fresh"
+    assert Transaction.query.count() == 2
+
+
+def test_repeated_collisions_give_up(user, monkeypatch):
+    existing = create_transaction(amount=100, gateway="paystack", customer_id=user.id)
+    monkeypatch.setattr(transaction_service, "generate_reference", lambda: existing.gateway_ref)
+
+    with pytest.raises(IntegrityError):
+        create_transaction(amount=200, gateway="paystack", customer_id=user.id)
+
+
+def _enforce_foreign_keys(dbapi_connection, record):
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+def test_foreign_key_errors_are_not_retried(app, monkeypatch):
+    # SQLite only enforces foreign keys when asked to, per connection
+    event.listen(db.engine, "connect", _enforce_foreign_keys)
+    db.engine.dispose()
+    attempts = []
+    generate = transaction_service.generate_reference
+    monkeypatch.setattr(transaction_service, "generate_reference", lambda: attempts.append(1) or generate())
+
+    try:
+        with pytest.raises(IntegrityError, match="FOREIGN KEY"):
+            create_transaction(amount=100, gateway="paystack", customer_id=999)
+    finally:
+        event.remove(db.engine, "connect", _enforce_foreign_keys)
+        db.engine.dispose()
+
+    assert len(attempts) == 1
@@ -0,0 +1,7 @@
+from server import create_app
+
+# ----------------------------------
+# Production entry point. Unlike run.py this never creates the schema on import;
+# run `flask --app wsgi init-db` once per deployment instead.
+
+app = create_app()